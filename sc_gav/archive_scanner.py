@@ -0,0 +1,173 @@
+#  The MIT License (MIT)
+#
+#  Copyright (c) 2021. Scott Lau
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#  SOFTWARE.
+
+import csv
+import io
+import logging
+import os
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from sc_hash.hash_utils import HashUtils
+
+from .search_constants import SearchConstants
+
+
+class ArchiveScanner:
+    """
+    Generate lib-hash.csv for jars, including the jars nested in Spring Boot
+    fat jars, WARs and EARs.
+
+    Nested jars are streamed from the outer archive into the hasher without
+    being extracted to disk, and are reported with a synthetic path such as
+    ``app.war!/WEB-INF/lib/x.jar``.
+    """
+    ARCHIVE_EXTENSIONS = ('.jar', '.war', '.ear')
+    NESTED_SEPARATOR = '!/'
+    # directories holding the libraries of fat jars and WARs
+    NESTED_LIB_DIRECTORIES = ('BOOT-INF/lib/', 'WEB-INF/lib/')
+    # library directory of EARs, modules of an EAR are stored in its root
+    EAR_LIB_DIRECTORY = 'lib/'
+
+    def __init__(self):
+        pass
+
+    @staticmethod
+    def generate_hash(lib_paths, *, workers=4, hash_name=SearchConstants.DEFAULT_HASH_NAME,
+                      report_file='lib-hash.csv', profiler=None):
+        """
+        Hash all archives in the given directories, outer archives are scanned in parallel.
+
+        :param lib_paths: directories or archive files to be scanned.
+        :param workers: number of outer archives scanned concurrently.
+        :type workers: int
+        :param hash_name: name of the hash algorithm in hashlib.
+        :param report_file: the generated csv file.
+        :param profiler: optional :py:class:`sc_gav.profiler.StageProfiler` of the scans in the worker threads.
+        """
+        logging.getLogger(__name__).info('generating hash of nested archives...')
+        archives = []
+        for lib_path in lib_paths:
+            archives.extend(ArchiveScanner.list_archives(lib_path))
+        with open(report_file, 'w', newline='', encoding='utf-8') as csv_file:
+            writer = csv.writer(csv_file)
+            writer.writerow(['File Name', hash_name])
+            scan = lambda archive: ArchiveScanner.scan_archive(archive, hash_name)
+            if profiler is not None:
+                scan = profiler.wrap(scan)
+            with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+                for file_and_hashes in executor.map(scan, archives):
+                    for file_and_hash in file_and_hashes:
+                        writer.writerow([file_and_hash['filename'], file_and_hash[hash_name]])
+        logging.getLogger(__name__).info('generate hash of %d archives done', len(archives))
+
+    @staticmethod
+    def list_archives(lib_path):
+        normalized_path = os.path.normpath(lib_path)
+        if os.path.isfile(normalized_path):
+            return [normalized_path]
+        archives = []
+        try:
+            for entry in os.scandir(normalized_path):
+                if entry.is_file() and ArchiveScanner.is_archive(entry.name):
+                    archives.append(entry.path)
+        except OSError as e:
+            logging.getLogger(__name__).exception("Failed to scan directory %s", normalized_path, exc_info=e)
+        return sorted(archives)
+
+    @staticmethod
+    def scan_archive(archive_path, hash_name=SearchConstants.DEFAULT_HASH_NAME):
+        """
+        Hash an archive and every library nested in it.
+
+        :param archive_path: path of the outer archive.
+        :param hash_name: name of the hash algorithm in hashlib.
+        :return: a list of dicts with ``filename`` and the hash value.
+        :rtype: list
+        """
+        logging.getLogger(__name__).debug('scan archive %s', archive_path)
+        try:
+            results = [{'filename': archive_path, hash_name: HashUtils.calculate_hash(hash_name, archive_path)}]
+            with zipfile.ZipFile(archive_path) as archive:
+                results.extend(ArchiveScanner._scan_nested(archive, archive_path, hash_name))
+        except (OSError, zipfile.BadZipFile) as e:
+            logging.getLogger(__name__).warning('failed to scan archive %s, cause: %s', archive_path, e)
+            return []
+        return results
+
+    @staticmethod
+    def _scan_nested(archive, archive_name, hash_name):
+        results = []
+        is_ear = archive_name.lower().endswith('.ear')
+        for info in archive.infolist():
+            if not ArchiveScanner._is_nested_library(info.filename, is_ear):
+                continue
+            nested_name = archive_name + ArchiveScanner.NESTED_SEPARATOR + info.filename
+            if info.filename.lower().endswith('.jar'):
+                with archive.open(info) as nested_file:
+                    hash_value = HashUtils.calculate_hash(hash_name, nested_file)
+                results.append({'filename': nested_name, hash_name: hash_value})
+                continue
+            # WAR module of an EAR, read it in memory to scan its libraries
+            nested_bytes = io.BytesIO(archive.read(info))
+            results.append({'filename': nested_name, hash_name: HashUtils.calculate_hash(hash_name, nested_bytes)})
+            nested_bytes.seek(0)
+            try:
+                with zipfile.ZipFile(nested_bytes) as nested_archive:
+                    results.extend(ArchiveScanner._scan_nested(nested_archive, nested_name, hash_name))
+            except zipfile.BadZipFile as e:
+                logging.getLogger(__name__).warning('failed to scan archive %s, cause: %s', nested_name, e)
+        return results
+
+    @staticmethod
+    def _is_nested_library(entry_name, is_ear):
+        lower_name = entry_name.lower()
+        if is_ear:
+            if '/' not in entry_name:
+                return lower_name.endswith('.jar') or lower_name.endswith('.war')
+            return entry_name.startswith(ArchiveScanner.EAR_LIB_DIRECTORY) and lower_name.endswith('.jar')
+        return entry_name.startswith(ArchiveScanner.NESTED_LIB_DIRECTORIES) and lower_name.endswith('.jar')
+
+    @staticmethod
+    def is_archive(filename):
+        return os.path.splitext(filename.lower())[1] in ArchiveScanner.ARCHIVE_EXTENSIONS
+
+    @staticmethod
+    @contextmanager
+    def open_archive(path):
+        """
+        Open a file or a nested archive given by a synthetic path such as
+        ``app.war!/WEB-INF/lib/x.jar``.
+
+        :return: a seekable binary file handle.
+        """
+        names = path.split(ArchiveScanner.NESTED_SEPARATOR)
+        with open(names[0], 'rb') as outer_file:
+            if len(names) == 1:
+                yield outer_file
+                return
+            handle = outer_file
+            for name in names[1:]:
+                with zipfile.ZipFile(handle) as archive:
+                    handle = io.BytesIO(archive.read(name))
+            yield handle
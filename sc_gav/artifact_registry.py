@@ -0,0 +1,115 @@
+#  The MIT License (MIT)
+#
+#  Copyright (c) 2021. Scott Lau
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#  SOFTWARE.
+
+from array import array
+
+
+class StringTable(object):
+    """
+    Stores each distinct string once and refers to it by an integer id.
+    """
+
+    def __init__(self):
+        self._ids = {}
+        self._strings = []
+
+    def intern(self, value):
+        """
+        Get the id of a string, adding it to the table if needed.
+
+        :param value: the string.
+        :type value: str
+        :rtype: int
+        """
+        string_id = self._ids.get(value)
+        if string_id is None:
+            string_id = len(self._strings)
+            self._ids[value] = string_id
+            self._strings.append(value)
+        return string_id
+
+    def get(self, string_id):
+        return self._strings[string_id]
+
+    def __len__(self):
+        return len(self._strings)
+
+
+class ArtifactRegistry(object):
+    """
+    A compact registry of the distinct artifacts of a project.
+
+    groupIds, artifactIds and versions are interned in string tables, an
+    artifact is a triple of string ids stored in parallel arrays and referred
+    to by its index. Artifacts are deduplicated on the triple, so distinct
+    coordinates never collide.
+
+    Iterating the registry yields one ``groupId``/``artifactId``/``version``
+    dict per artifact, in the order the artifacts were first added.
+    """
+
+    def __init__(self):
+        self._group_ids = StringTable()
+        self._artifact_ids = StringTable()
+        self._versions = StringTable()
+        self._index = {}
+        self._artifact_group_ids = array('L')
+        self._artifact_artifact_ids = array('L')
+        self._artifact_versions = array('L')
+
+    def add(self, group_id, artifact_id, version):
+        """
+        Register an artifact.
+
+        :return: a ``(artifact index, is new artifact)`` tuple.
+        :rtype: tuple
+        """
+        key = (self._group_ids.intern(group_id), self._artifact_ids.intern(artifact_id),
+               self._versions.intern(version))
+        index = self._index.get(key)
+        is_new = index is None
+        if is_new:
+            index = len(self._artifact_group_ids)
+            self._index[key] = index
+            self._artifact_group_ids.append(key[0])
+            self._artifact_artifact_ids.append(key[1])
+            self._artifact_versions.append(key[2])
+        return index, is_new
+
+    def get(self, index):
+        """
+        Get an artifact by its index.
+
+        :rtype: dict
+        """
+        return {
+            'groupId': self._group_ids.get(self._artifact_group_ids[index]),
+            'artifactId': self._artifact_ids.get(self._artifact_artifact_ids[index]),
+            'version': self._versions.get(self._artifact_versions[index]),
+        }
+
+    def __len__(self):
+        return len(self._artifact_group_ids)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self.get(index)
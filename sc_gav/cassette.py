@@ -0,0 +1,164 @@
+#  The MIT License (MIT)
+#
+#  Copyright (c) 2021. Scott Lau
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#  SOFTWARE.
+
+import datetime
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from .exception import HttpClientAPIError
+
+
+class CassetteMissException(HttpClientAPIError):
+    """
+    No response was recorded for a request replayed from a cassette.
+    """
+    pass
+
+
+class Cassette(object):
+    """
+    Records backend responses into a sqlite file, or replays them without
+    any network request.
+
+    Responses are keyed by the request method and the url with its query
+    parameters in sorted order, bodies are stored zlib compressed. Headers
+    describing the transfer of the original body are not recorded.
+
+    Args:
+        path (str): path of the cassette file.
+        mode (str): ``record`` or ``replay``.
+        latency_scale (float): when replaying, sleep this multiple of the
+            recorded response time before returning a response, ``0`` to
+            return immediately.
+    """
+    RECORD = 'record'
+    REPLAY = 'replay'
+    MODES = (RECORD, REPLAY)
+    SKIPPED_HEADERS = ('content-encoding', 'content-length', 'transfer-encoding', 'connection')
+
+    def __init__(self, *, path, mode, latency_scale=0):
+        if mode not in Cassette.MODES:
+            raise ValueError('unknown cassette mode {0}'.format(mode))
+        if mode == Cassette.REPLAY and not os.path.isfile(path):
+            raise FileNotFoundError('cassette {0} not found'.format(path))
+        self._path = path
+        self._mode = mode
+        self._latency_scale = latency_scale
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, "
+            "status INTEGER NOT NULL, "
+            "headers TEXT NOT NULL, "
+            "body BLOB NOT NULL, "
+            "elapsed REAL NOT NULL)")
+        self._connection.commit()
+
+    @property
+    def mode(self):
+        """
+        ``record`` or ``replay``.
+
+        :rtype: str
+        """
+        return self._mode
+
+    def request(self, session, method, url, **kwargs):
+        """
+        Send a request with the session and record its response, or replay
+        the recorded response.
+
+        :param session: the session sending recorded requests.
+        :type session: requests.Session
+        :param method: the http method.
+        :param url: the url without query parameters of ``kwargs``.
+        :param kwargs: as per :py:func:`requests.request`.
+        :rtype: requests.Response
+        """
+        key = Cassette.request_key(method, url, kwargs.get('params'))
+        if self._mode == Cassette.REPLAY:
+            return self._replay(key, method, url, kwargs.get('params'))
+        response = session.request(method=method, url=url, **kwargs)
+        self._record(key, response)
+        return response
+
+    def _record(self, key, response):
+        headers = {name: value for name, value in response.headers.items()
+                   if name.lower() not in Cassette.SKIPPED_HEADERS}
+        with self._lock:
+            with self._connection:
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO responses (key, status, headers, body, elapsed) VALUES (?, ?, ?, ?, ?)",
+                    (key, response.status_code, json.dumps(headers), zlib.compress(response.content),
+                     response.elapsed.total_seconds()))
+        logging.getLogger(__name__).debug('recorded response of %s', key)
+
+    def _replay(self, key, method, url, params):
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT status, headers, body, elapsed FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            raise CassetteMissException('no recorded response for {0}'.format(key))
+        status, headers, body, elapsed = row
+        if self._latency_scale > 0:
+            time.sleep(elapsed * self._latency_scale)
+        response = requests.Response()
+        response.status_code = status
+        response.headers = CaseInsensitiveDict(json.loads(headers))
+        response._content = zlib.decompress(body)
+        # the body is already read, so that streamed responses can be iterated
+        response._content_consumed = True
+        response.elapsed = datetime.timedelta(seconds=elapsed)
+        response.request = requests.Request(method=method.upper(), url=url, params=params).prepare()
+        response.url = response.request.url
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        return response
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+    @staticmethod
+    def request_key(method, url, params=None):
+        """
+        Normalize a request into a cassette key.
+
+        :return: the upper case method and the url with sorted query parameters.
+        :rtype: str
+        """
+        prepared_url = requests.Request(method=method.upper(), url=url, params=params).prepare().url
+        parts = urlsplit(prepared_url)
+        query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+        return method.upper() + ' ' + urlunsplit((parts.scheme, parts.netloc.lower(), parts.path, query, ''))
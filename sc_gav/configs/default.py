@@ -28,8 +28,84 @@ DEFAULT_CONFIG = {
     "search": {
         "url": "https://search.maven.org",
         "retries": 3,
+        # file name prefixes of internal jars, which are not expected to be found online
+        "internal_prefixes": [],
+        # defer to search internal jars after all other jars, skip to never search them online
+        "internal_policy": "defer",
+    },
+    # throughput tuning, validated when the program starts
+    "performance": {
+        # number of concurrent searches
+        "workers": 4,
+        # number of concurrent verification requests
+        "verify_workers": 8,
+        # number of archives scanned concurrently when scanning nested archives
+        "scan_workers": 4,
+        # number of artifacts stored in the cache per transaction
+        "batch_size": 1000,
+        # connect and read timeouts of backend requests in seconds
+        "connect_timeout": 3.15,
+        "read_timeout": 27,
+        # maximum number of kept-alive connections, 0 for the largest number of workers
+        "pool_size": 0,
+        # maximum number of requests per second, 0 for no limit
+        "rate_limit": 0,
+    },
+    # local sha1 to GAV lookup store
+    "cache": {
+        "enabled": True,
+        "path": "/var/opt/sc/.sc-search-gav/gav-cache.db",
+        # sqlite or partitioned
+        "layout": "sqlite",
+        "segments_path": "/var/opt/sc/.sc-search-gav/gav-cache",
+        "compact_size": 1048576,
+        # seconds after which a cached artifact is looked up again, 0 for never
+        "ttl": 0,
+    },
+    # verification of the artifacts pre-filled in lib-hash.csv
+    "verify": {
+        "enabled": False,
+    },
+    # similarity matching of jars whose hash value cannot be found
+    "fingerprint": {
+        "enabled": False,
+        "index_path": "/var/opt/sc/.sc-search-gav/fingerprint-index.db",
+        # minimum estimated share of identical classes for a match
+        "threshold": 0.8,
+    },
+    # periodic progress summary of long running searches
+    "progress": {
+        # minimum number of seconds between two summaries
+        "interval": 10,
+        # optional json file updated with every summary
+        "file": "",
+    },
+    # recording or replaying of backend responses, e.g. for offline benchmarks
+    "cassette": {
+        # record, replay, or empty to send requests normally
+        "mode": "",
+        "path": "/var/opt/sc/.sc-search-gav/cassette.db",
+        # when replaying, multiple of the recorded response time waited, 0 to respond immediately
+        "latency_scale": 0,
+    },
+    # HTTP cache of the backend responses honoring Cache-Control, ETag and Last-Modified,
+    # disabled while a cassette is recorded or replayed
+    "http_cache": {
+        "enabled": False,
+        "path": "/var/opt/sc/.sc-search-gav/http-cache.db",
+    },
+    "tracing": {
+        # optional json lines file receiving one span per backend request
+        "file": "",
+    },
+    "output": {
+        # reports written while searching, any of csv (report.csv), jsonl (report.jsonl)
+        # and cyclonedx (bom.json)
+        "formats": ["csv"],
     },
     # directories to be scanned for jars
     "scan_libs": [
     ],
+    # whether to hash the jars nested in fat jars, WARs and EARs found in scan_libs
+    "scan_nested_archives": False,
 }
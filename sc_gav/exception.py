@@ -62,3 +62,10 @@ class ParameterNotProvidedException(HttpClientAPIError):
     Parameter ‘repository’ is required. Usually the result of a HTTP 422 response.
     """
     pass
+
+
+class InvalidConfigurationException(Exception):
+    """
+    A configuration value is missing, of the wrong type or out of range.
+    """
+    pass
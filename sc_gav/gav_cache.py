@@ -0,0 +1,134 @@
+#  The MIT License (MIT)
+#
+#  Copyright (c) 2021. Scott Lau
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#  SOFTWARE.
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+
+class GavCache(object):
+    """
+    A local sha1 to GAV lookup store backed by a sqlite database.
+
+    Args:
+        path (str): path of the sqlite database file.
+        ttl (float): seconds after which a stored artifact expires, ``0`` for never.
+    """
+    DEFAULT_BATCH_SIZE = 1000
+
+    def __init__(self, *, path, ttl=0):
+        self._path = path
+        self._ttl = ttl
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS artifacts ("
+            "sha1 TEXT PRIMARY KEY, "
+            "group_id TEXT NOT NULL, "
+            "artifact_id TEXT NOT NULL, "
+            "version TEXT NOT NULL, "
+            "updated REAL NOT NULL)")
+        self._connection.commit()
+
+    @property
+    def path(self):
+        """
+        Path of the cache database.
+
+        :rtype: str
+        """
+        return self._path
+
+    def get(self, sha1):
+        """
+        Look up the artifact of the given hash value.
+
+        :param sha1: the sha1 hash value.
+        :type sha1: str
+        :return: a dict with ``groupId``, ``artifactId`` and ``version``, or
+            ``None`` if the hash value is not in the cache or expired.
+        :rtype: dict
+        """
+        # expired artifacts are replaced when they are stored again
+        min_updated = time.time() - self._ttl if self._ttl > 0 else 0
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT group_id, artifact_id, version FROM artifacts WHERE sha1 = ? AND updated >= ?",
+                (GavCache.normalize_hash(sha1), min_updated)).fetchone()
+        if row is None:
+            return None
+        return {'groupId': row[0], 'artifactId': row[1], 'version': row[2]}
+
+    def put(self, sha1, *, group_id, artifact_id, version):
+        """
+        Store the artifact of the given hash value.
+
+        :param sha1: the sha1 hash value.
+        :param group_id: the groupId of the artifact.
+        :param artifact_id: the artifactId of the artifact.
+        :param version: the version of the artifact.
+        """
+        self.put_many([(sha1, group_id, artifact_id, version)])
+
+    def put_many(self, artifacts, batch_size=DEFAULT_BATCH_SIZE):
+        """
+        Store artifacts in bulk, committing one transaction per batch.
+
+        :param artifacts: iterable of ``(sha1, groupId, artifactId, version)`` tuples.
+        :param batch_size: number of rows inserted per transaction.
+        :type batch_size: int
+        :return: the number of rows stored.
+        :rtype: int
+        """
+        count = 0
+        batch = []
+        for sha1, group_id, artifact_id, version in artifacts:
+            batch.append((GavCache.normalize_hash(sha1), group_id, artifact_id, version, time.time()))
+            if len(batch) >= batch_size:
+                self._insert_batch(batch)
+                count += len(batch)
+                batch = []
+        if len(batch) > 0:
+            self._insert_batch(batch)
+            count += len(batch)
+        return count
+
+    def _insert_batch(self, batch):
+        with self._lock:
+            with self._connection:
+                self._connection.executemany(
+                    "INSERT OR REPLACE INTO artifacts (sha1, group_id, artifact_id, version, updated) "
+                    "VALUES (?, ?, ?, ?, ?)", batch)
+        logging.getLogger(__name__).debug('stored %d artifacts in cache', len(batch))
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+    @staticmethod
+    def normalize_hash(sha1):
+        return sha1.strip().lower()
@@ -0,0 +1,165 @@
+#  The MIT License (MIT)
+#
+#  Copyright (c) 2021. Scott Lau
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#  SOFTWARE.
+
+import json
+import logging
+import os
+
+from .project_config_file_utils import ProjectConfigFileUtils
+from .search_constants import SearchConstants
+
+
+class GavCacheImporter:
+    """
+    Bulk import previously resolved artifacts into a :py:class:`GavCache`.
+
+    Supported sources:
+
+    * ``.csv`` files in the report.csv format, only rows marked ``Found == "Y"`` and not found with a
+      fingerprint are imported;
+    * ``.jsonl`` files with one ``{"sha1": ..., "groupId": ..., "artifactId": ..., "version": ...}`` object per line;
+    * any other file is read as a ``sha1  groupId:artifactId:version`` dump.
+
+    Directories are walked recursively for files with the extensions above.
+    """
+    SCANNED_EXTENSIONS = ('.csv', '.jsonl', '.txt')
+
+    def __init__(self):
+        pass
+
+    @staticmethod
+    def import_files(cache, paths, batch_size=None):
+        """
+        Import all artifacts found in the given files or directories.
+
+        :param cache: the destination cache.
+        :type cache: GavCache or PartitionedGavCache
+        :param paths: files or directories to import.
+        :param batch_size: number of rows inserted per transaction.
+        :return: the number of rows imported.
+        :rtype: int
+        """
+        if batch_size is None:
+            batch_size = cache.DEFAULT_BATCH_SIZE
+        artifacts = GavCacheImporter._parse_files(GavCacheImporter._list_files(paths))
+        count = cache.put_many(artifacts, batch_size=batch_size)
+        logging.getLogger(__name__).info('imported %d artifacts into %s', count, cache.path)
+        return count
+
+    @staticmethod
+    def _list_files(paths):
+        for path in paths:
+            if not os.path.isdir(path):
+                yield path
+                continue
+            for root, _, filenames in os.walk(path):
+                for filename in sorted(filenames):
+                    if os.path.splitext(filename.lower())[1] in GavCacheImporter.SCANNED_EXTENSIONS:
+                        yield os.path.join(root, filename)
+
+    @staticmethod
+    def _parse_files(filenames):
+        for filename in filenames:
+            logging.getLogger(__name__).info('importing artifacts from %s', filename)
+            extension = os.path.splitext(filename.lower())[1]
+            if extension == '.csv':
+                yield from GavCacheImporter.parse_report_csv(filename)
+            elif extension == '.jsonl':
+                yield from GavCacheImporter.parse_jsonl(filename)
+            else:
+                yield from GavCacheImporter.parse_dump(filename)
+
+    @staticmethod
+    def parse_report_csv(filename):
+        for dependency in ProjectConfigFileUtils.parse_dependencies_from_csv(filename):
+            # fingerprint matches are similar jars, not jars with this hash value
+            if dependency['found'] != 'Y' or dependency['found_with'] == 'fingerprint':
+                continue
+            artifact = GavCacheImporter._to_artifact(dependency[SearchConstants.DEFAULT_HASH_NAME],
+                                                     dependency['groupId'],
+                                                     dependency['artifactId'],
+                                                     dependency['version'])
+            if artifact is not None:
+                yield artifact
+
+    @staticmethod
+    def parse_jsonl(filename):
+        try:
+            with open(filename, encoding='utf-8') as jsonl_file:
+                invalid_lines = 0
+                for line in jsonl_file:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        item = json.loads(line)
+                    except ValueError:
+                        invalid_lines += 1
+                        continue
+                    if not isinstance(item, dict):
+                        invalid_lines += 1
+                        continue
+                    # lines of report.jsonl files are filtered like the rows of report.csv files
+                    if 'found' in item and (item['found'] != 'Y' or item.get('found_with') == 'fingerprint'):
+                        continue
+                    artifact = GavCacheImporter._to_artifact(item.get(SearchConstants.DEFAULT_HASH_NAME),
+                                                             item.get('groupId'),
+                                                             item.get('artifactId'),
+                                                             item.get('version'))
+                    if artifact is not None:
+                        yield artifact
+                GavCacheImporter._log_invalid_lines(filename, invalid_lines)
+        except FileNotFoundError as error:
+            logging.getLogger(__name__).error("file %s not found, cause: %s", filename, error)
+
+    @staticmethod
+    def parse_dump(filename):
+        try:
+            with open(filename, encoding='utf-8') as dump_file:
+                invalid_lines = 0
+                for line in dump_file:
+                    elements = line.split()
+                    if len(elements) == 0 or elements[0].startswith('#'):
+                        continue
+                    coordinates = elements[1].split(':') if len(elements) == 2 else []
+                    if len(coordinates) < 3:
+                        invalid_lines += 1
+                        continue
+                    # groupId:artifactId[:packaging[:classifier]]:version
+                    artifact = GavCacheImporter._to_artifact(elements[0], coordinates[0], coordinates[1],
+                                                             coordinates[-1])
+                    if artifact is not None:
+                        yield artifact
+                GavCacheImporter._log_invalid_lines(filename, invalid_lines)
+        except FileNotFoundError as error:
+            logging.getLogger(__name__).error("file %s not found, cause: %s", filename, error)
+
+    @staticmethod
+    def _log_invalid_lines(filename, invalid_lines):
+        if invalid_lines > 0:
+            logging.getLogger(__name__).warning('skipped %d invalid lines in %s', invalid_lines, filename)
+
+    @staticmethod
+    def _to_artifact(sha1, group_id, artifact_id, version):
+        if not sha1 or not group_id or not artifact_id or not version:
+            return None
+        return sha1, group_id, artifact_id, version
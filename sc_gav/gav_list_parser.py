@@ -0,0 +1,136 @@
+#  The MIT License (MIT)
+#
+#  Copyright (c) 2021. Scott Lau
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#  SOFTWARE.
+
+import logging
+import os
+import xml.etree.ElementTree as ElementTree
+
+
+class GavListParser:
+    """
+    Collect the distinct artifacts to be prefetched into the local cache.
+
+    Supported sources:
+
+    * ``.xml`` files in the pom.xml format, the ``dependencies`` of the project
+      and of its ``dependencyManagement`` section are read;
+    * any other file is read as a list of ``groupId:artifactId[:packaging[:classifier]]:version``
+      coordinates, one per line.
+
+    Directories are walked recursively for pom.xml files.
+    """
+    POM_FILENAME = 'pom.xml'
+
+    def __init__(self):
+        pass
+
+    @staticmethod
+    def parse_files(paths):
+        """
+        Parse the artifacts of the given files or directories.
+
+        :param paths: files or directories to parse.
+        :return: a list of dicts with ``groupId``, ``artifactId``, ``version``,
+            ``packaging`` and ``classifier``, without duplicates.
+        :rtype: list
+        """
+        artifacts = {}
+        for filename in GavListParser._list_files(paths):
+            logging.getLogger(__name__).info('reading artifacts from %s', filename)
+            if filename.lower().endswith('.xml'):
+                parsed_artifacts = GavListParser.parse_pom(filename)
+            else:
+                parsed_artifacts = GavListParser.parse_gav_list(filename)
+            for artifact in parsed_artifacts:
+                key = (artifact['groupId'], artifact['artifactId'], artifact['version'], artifact['packaging'],
+                       artifact['classifier'])
+                artifacts.setdefault(key, artifact)
+        return list(artifacts.values())
+
+    @staticmethod
+    def _list_files(paths):
+        for path in paths:
+            if not os.path.isdir(path):
+                yield path
+                continue
+            for root, _, filenames in os.walk(path):
+                if GavListParser.POM_FILENAME in filenames:
+                    yield os.path.join(root, GavListParser.POM_FILENAME)
+
+    @staticmethod
+    def parse_gav_list(filename):
+        try:
+            with open(filename, encoding='utf-8') as list_file:
+                invalid_lines = 0
+                for line in list_file:
+                    line = line.strip()
+                    if not line or line.startswith('#'):
+                        continue
+                    coordinates = line.split(':')
+                    if len(coordinates) < 3 or len(coordinates) > 5 or not all(coordinates):
+                        invalid_lines += 1
+                        continue
+                    yield GavListParser._to_artifact(group_id=coordinates[0], artifact_id=coordinates[1],
+                                                     version=coordinates[-1],
+                                                     packaging=coordinates[2] if len(coordinates) > 3 else None,
+                                                     classifier=coordinates[3] if len(coordinates) > 4 else None)
+                if invalid_lines > 0:
+                    logging.getLogger(__name__).warning('skipped %d invalid lines in %s', invalid_lines, filename)
+        except FileNotFoundError as error:
+            logging.getLogger(__name__).error("file %s not found, cause: %s", filename, error)
+
+    @staticmethod
+    def parse_pom(filename):
+        try:
+            root = ElementTree.parse(filename).getroot()
+        except (OSError, ElementTree.ParseError) as error:
+            logging.getLogger(__name__).error("failed to parse %s, cause: %s", filename, error)
+            return
+        # elements of a pom.xml are usually in the Maven POM namespace
+        namespace = root.tag[:root.tag.index('}') + 1] if root.tag.startswith('{') else ''
+        skipped_dependencies = 0
+        for dependency in root.iter(namespace + 'dependency'):
+            values = {}
+            for name in ('groupId', 'artifactId', 'version', 'type', 'classifier'):
+                element = dependency.find(namespace + name)
+                values[name] = element.text.strip() if element is not None and element.text else None
+            # versions defined by properties or by a parent pom can not be resolved here
+            if not values['groupId'] or not values['artifactId'] or not values['version'] \
+                    or '${' in ''.join(values[name] for name in ('groupId', 'artifactId', 'version')):
+                skipped_dependencies += 1
+                continue
+            yield GavListParser._to_artifact(group_id=values['groupId'], artifact_id=values['artifactId'],
+                                             version=values['version'], packaging=values['type'],
+                                             classifier=values['classifier'])
+        if skipped_dependencies > 0:
+            logging.getLogger(__name__).warning('skipped %d dependencies without explicit coordinates in %s',
+                                                skipped_dependencies, filename)
+
+    @staticmethod
+    def _to_artifact(*, group_id, artifact_id, version, packaging=None, classifier=None):
+        return {
+            'groupId': group_id,
+            'artifactId': artifact_id,
+            'version': version,
+            'packaging': packaging or 'jar',
+            'classifier': classifier or '',
+        }
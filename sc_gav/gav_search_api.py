@@ -31,11 +31,19 @@ class GavSearchClient(RequestClient):
 
     Args:
         url (str): the url.
+        pool_size (int): maximum number of kept-alive connections.
+        timeout (tuple): connect and read timeouts in seconds.
+        tracer (RequestTracer): optional tracer receiving one span per request.
+        cassette (Cassette): optional cassette recording or replaying the responses.
+        http_cache (HttpCache): optional cache storing and revalidating the responses.
     """
     SEARCH_ENDPOINT = "solrsearch/select"
+    REMOTE_CONTENT_ENDPOINT = "remotecontent"
 
-    def __init__(self, *, url):
-        super(GavSearchClient, self).__init__(url=url, x509_verify=True)
+    def __init__(self, *, url, pool_size=10, timeout=RequestClient.DEFAULT_TIMEOUT, tracer=None, cassette=None,
+                 http_cache=None):
+        super(GavSearchClient, self).__init__(url=url, x509_verify=True, pool_size=pool_size, timeout=timeout,
+                                              tracer=tracer, cassette=cassette, http_cache=http_cache)
 
     @staticmethod
     def get_query_str(params):
@@ -49,14 +57,15 @@ class GavSearchClient(RequestClient):
             query_str += key + ':"' + value + '"'
         return query_str
 
-    def search_with_sha1(self, sha1):
+    def search_with_sha1(self, sha1, attempt=1):
         params = {"1": sha1}
         query_params = {
             "q": GavSearchClient.get_query_str(params)
         }
-        return self.http_request(method="get", endpoint=GavSearchClient.SEARCH_ENDPOINT, params=query_params)
+        return self.http_request(method="get", endpoint=GavSearchClient.SEARCH_ENDPOINT, attempt=attempt,
+                                 params=query_params)
 
-    def search_with_artifact(self, *, group_id, artifact_id, version, packaging="jar"):
+    def search_with_artifact(self, *, group_id, artifact_id, version, packaging="jar", attempt=1):
         params = {
             "g": group_id,
             "a": artifact_id,
@@ -66,10 +75,36 @@ class GavSearchClient(RequestClient):
         query_params = {
             "q": GavSearchClient.get_query_str(params)
         }
-        return self.http_request(method="get", endpoint=GavSearchClient.SEARCH_ENDPOINT, params=query_params)
+        return self.http_request(method="get", endpoint=GavSearchClient.SEARCH_ENDPOINT, attempt=attempt,
+                                 params=query_params)
+
+    def get_artifact_sha1(self, *, group_id, artifact_id, version, packaging="jar", classifier="", attempt=1):
+        """
+        Download the sha1 checksum file of an artifact from the repository.
+        """
+        filename = artifact_id + "-" + version
+        if classifier:
+            filename += "-" + classifier
+        file_path = "/".join(group_id.split(".") + [artifact_id, version, filename + "." + packaging + ".sha1"])
+        return self.http_request(method="get", endpoint=GavSearchClient.REMOTE_CONTENT_ENDPOINT, attempt=attempt,
+                                 params={"filepath": file_path})
 
     @staticmethod
-    def parse_online_search_result(response):
+    def parse_sha1_result(response):
+        if response is None or response.status_code != 200:
+            return None
+        # checksum files may be followed by the name of the artifact file
+        elements = response.text.split()
+        if len(elements) == 0 or len(elements[0]) != 40:
+            return None
+        try:
+            int(elements[0], 16)
+        except ValueError:
+            return None
+        return elements[0].lower()
+
+    @staticmethod
+    def _parse_docs(response):
         if response is None:
             return None
         ret_json = response.json()
@@ -80,14 +115,33 @@ class GavSearchClient(RequestClient):
         num_found = int(ret_json['response']["numFound"])
         if num_found == 0:
             return None
-        if "docs" not in ret_json['response']:
+        if "docs" not in ret_json['response'] or len(ret_json['response']["docs"]) == 0:
+            return None
+        return ret_json['response']["docs"]
+
+    @staticmethod
+    def parse_online_search_results(response):
+        """
+        Parse all the artifacts of a search response.
+
+        :return: a list of artifacts, in the order of the response.
+        :rtype: list
+        """
+        docs = GavSearchClient._parse_docs(response)
+        if docs is None:
+            return []
+        return [{'groupId': doc['g'], 'artifactId': doc['a'], 'version': doc['v']} for doc in docs]
+
+    @staticmethod
+    def parse_online_search_result(response):
+        docs = GavSearchClient._parse_docs(response)
+        if docs is None:
             return None
         # found artifact
-        docs = ret_json['response']["docs"]
         item = docs[0]
         oldest_timestamp = item['timestamp']
         if len(docs) > 1:
-            logging.getLogger(__name__).warning('multiple artifacts found, choose the oldest artifact')
+            logging.getLogger(__name__).debug('multiple artifacts found, choose the oldest artifact')
             # choose the oldest artifact
             for doc in docs:
                 timestamp = doc['timestamp']
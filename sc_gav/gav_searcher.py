@@ -20,148 +20,735 @@
 #  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 #  SOFTWARE.
 
-import csv
 import logging
 import os
+import re
+import sqlite3
+import zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from scutils import Singleton
 
+from .archive_scanner import ArchiveScanner
+from .artifact_registry import ArtifactRegistry
+from .cassette import Cassette, CassetteMissException
 from .exception import *
+from .gav_cache import GavCache
 from .gav_search_api import GavSearchClient
+from .http_cache import HttpCache
+from .jar_fingerprint import FingerprintIndex, JarFingerprint
+from .partitioned_gav_cache import PartitionedGavCache
+from .profiler import StageProfiler
+from .progress import ProgressReporter
 from .project_config_file_utils import ProjectConfigFileUtils
+from .rate_limiter import RateLimiter
+from .report_writers import REPORT_WRITERS, ReportWriter
 from .search_constants import SearchConstants
-from .utils import config
+from .settings import Settings
+from .tracing import JsonFileTracer
+
+logger = logging.getLogger(__name__)
 
 
 class GavSearcher(metaclass=Singleton):
+    # file names like artifactId-version.jar, the version starting with a digit
+    VERSIONED_FILENAME_PATTERN = re.compile(r'^[a-z][\w.]*(?:-[a-z][\w.]*)*-\d[\w.+-]*\.[jew]ar$', re.IGNORECASE)
 
     def __init__(self):
-        self._online_url = config.get("url") or "https://search.maven.org"
-        self._online_client = GavSearchClient(url=self._online_url)
+        settings = Settings()
+        self._online_url = settings.search_url
+        self._verify = settings.verify_enabled
+        self._verify_workers = settings.verify_workers
+        self._workers = settings.workers
+        self._batch_size = settings.batch_size
+        self._tracer = GavSearcher.create_tracer(settings)
+        self._cassette = GavSearcher.create_cassette(settings)
+        self._online_client = GavSearchClient(url=self._online_url, pool_size=settings.pool_size,
+                                              timeout=(settings.connect_timeout, settings.read_timeout),
+                                              tracer=self._tracer, cassette=self._cassette,
+                                              http_cache=GavSearcher.create_http_cache(settings))
         self._hash_file = "lib-hash.csv"
-        self._report_file = 'report.csv'
-        self._retries_str = config.get("retries") or "3"
-        self._retries = int(self._retries_str)
-        self._artifacts = {}
-        self._dependencies = []
-        self._exception_dependencies = []
-        self._unknown_dependencies = []
-
-    def search_dependency_gav(self):
-        dependencies = []
-        # if report.csv found, parse hash values from this file directly
-        source_file = self._hash_file
-        dependencies.extend(ProjectConfigFileUtils.parse_dependencies_from_csv(source_file))
-        self._search_dependencies(dependencies)
-        self._generate_project_config_files()
-        self._generate_report()
-
-    def _search_dependencies(self, dependencies):
+        self._output_formats = settings.output_formats
+        self._retries = settings.retries
+        self._internal_prefixes = tuple(prefix.lower() for prefix in settings.internal_prefixes)
+        self._skip_internal = settings.internal_policy == 'skip'
+        self._rate_limit = settings.rate_limit
+        self._rate_limiter = RateLimiter(rate=self._rate_limit)
+        self._cache = GavSearcher.create_cache(settings)
+        self._fingerprint_index = GavSearcher.create_fingerprint_index(settings)
+        self._fingerprint_threshold = settings.fingerprint_threshold
+        self._artifacts = ArtifactRegistry()
+        self._report_writers = []
+        self._progress_interval = settings.progress_interval
+        self._progress_file = settings.progress_file
+
+    @property
+    def batch_size(self):
+        """
+        Number of artifacts stored in the cache per transaction.
+
+        :rtype: int
+        """
+        return self._batch_size
+
+    @property
+    def cache(self):
+        """
+        The local lookup store, ``None`` if caching is disabled.
+
+        :rtype: GavCache or PartitionedGavCache
+        """
+        return self._cache
+
+    @staticmethod
+    def create_cache(settings):
+        if not settings.cache_enabled:
+            return None
+        if settings.cache_layout == "partitioned":
+            cache_path = settings.cache_segments_path
+        else:
+            cache_path = settings.cache_path
+        try:
+            if settings.cache_layout == "partitioned":
+                return PartitionedGavCache(path=cache_path, compact_size=settings.cache_compact_size,
+                                           ttl=settings.cache_ttl)
+            return GavCache(path=cache_path, ttl=settings.cache_ttl)
+        except (OSError, sqlite3.Error) as e:
+            logger.warning('failed to open cache %s, caching disabled, cause: %s', cache_path, e)
+            return None
+
+    @staticmethod
+    def create_cassette(settings):
+        if not settings.cassette_mode:
+            return None
+        try:
+            cassette = Cassette(path=settings.cassette_path, mode=settings.cassette_mode,
+                                latency_scale=settings.cassette_latency_scale)
+        except (OSError, sqlite3.Error) as e:
+            # never fall back to the network when a replay was requested
+            raise InvalidConfigurationException('failed to open cassette {0}, cause: {1}'.format(
+                settings.cassette_path, e))
+        logger.info('%s backend responses with cassette %s', 'recording' if cassette.mode == Cassette.RECORD
+                    else 'replaying', settings.cassette_path)
+        return cassette
+
+    @staticmethod
+    def create_http_cache(settings):
+        if not settings.http_cache_enabled:
+            return None
+        if settings.cassette_mode:
+            # a cassette must see every request and response exactly as sent and received
+            logger.warning('http cache disabled while a cassette is %s', 'recorded'
+                           if settings.cassette_mode == Cassette.RECORD else 'replayed')
+            return None
+        try:
+            return HttpCache(path=settings.http_cache_path)
+        except (OSError, sqlite3.Error) as e:
+            logger.warning('failed to open http cache %s, http caching disabled, cause: %s',
+                           settings.http_cache_path, e)
+            return None
+
+    @staticmethod
+    def create_tracer(settings):
+        trace_file = settings.tracing_file
+        if trace_file is None:
+            return None
+        try:
+            return JsonFileTracer(path=trace_file)
+        except OSError as e:
+            logger.warning('failed to open trace file %s, tracing disabled, cause: %s', trace_file, e)
+            return None
+
+    @staticmethod
+    def create_fingerprint_index(settings):
+        if not settings.fingerprint_enabled:
+            return None
+        index_path = settings.fingerprint_index_path
+        if not os.path.exists(index_path):
+            logger.warning('fingerprint index %s not found, fingerprint matching disabled', index_path)
+            return None
+        try:
+            return FingerprintIndex(path=index_path)
+        except sqlite3.Error as e:
+            logger.warning('failed to open fingerprint index %s, cause: %s', index_path, e)
+            return None
+
+    def search_dependency_gav(self, profiler=None):
+        self.search_projects([self._hash_file], profiler=profiler)
+
+    def plan_dependency_gav(self):
+        return self.plan_projects([self._hash_file])
+
+    def search_projects(self, hash_files, profiler=None):
+        """
+        Search the dependencies of one or more projects.
+
+        Every hash value is searched once, even if it is used by several
+        projects. The reports and build files of a project are written in the
+        directory of its hash file.
+
+        :param hash_files: the lib-hash.csv files of the projects.
+        :param profiler: optional profiler of the parsing, lookup and output stages.
+        :type profiler: StageProfiler
+        """
+        if profiler is None:
+            profiler = StageProfiler()
+        with profiler.stage('parsing'):
+            projects, dependencies, verifications, pending = self._collect_dependencies(hash_files)
+        logger.info('%d projects, %d dependencies, %d hash values to search', len(projects), len(dependencies),
+                    len(pending))
+        progress = ProgressReporter(total=len(verifications) + len(pending), interval=self._progress_interval,
+                                    progress_file=self._progress_file)
+        results = {}
+        searched_artifacts = ArtifactRegistry()
+        lookups = self._search_hashes(pending, progress, profiler)
+        with profiler.stage('lookup'):
+            if len(verifications) > 0:
+                verified = self._verify_dependencies(verifications, progress, profiler)
+                for dependency in dependencies:
+                    if dependency.get('found') == 'Y':
+                        dependency['verified'] = verified[GavSearcher._verification_key(dependency)]
+            # reports are streamed while searching a single project, unless the stages are profiled separately
+            if len(projects) > 1 or profiler.enabled:
+                # search the union of all projects first, then write each project from the shared results
+                for hash_value, result in lookups:
+                    results[hash_value] = GavSearcher._compact_result(result, searched_artifacts)
+        with profiler.stage('output'):
+            for hash_file, project_dependencies in projects:
+                self._write_project(os.path.dirname(hash_file) or '.', project_dependencies, results, lookups,
+                                    searched_artifacts)
+        lookups.close()
+        progress.finish()
+        self._log_http_cache_statistics()
+
+    def plan_projects(self, hash_files):
+        """
+        Estimate the work of :py:meth:`search_projects` from the local cache
+        and fingerprint index only, without any network request.
+
+        :param hash_files: the lib-hash.csv files of the projects.
+        :return: a dict of the estimated counts and wall time in seconds, the
+            wall time is ``None`` if no rate limit is configured.
+        :rtype: dict
+        """
+        projects, dependencies, verifications, pending = self._collect_dependencies(hash_files)
+        prefilled = sum(1 for dependency in dependencies if dependency.get('found') == 'Y')
+        cache_hits = 0
+        skipped = 0
+        fingerprint_matches = 0
+        for hash_value, filename in pending.items():
+            if self._search_cache(hash_value, filename) is not None:
+                cache_hits += 1
+                continue
+            if self._skip_internal and self._is_internal(filename):
+                skipped += 1
+            if self._search_fingerprint(hash_value, filename) is not None:
+                fingerprint_matches += 1
+        remote_lookups = len(pending) - cache_hits - skipped
+        # verifications are never served by the cache, a hash value unknown to the search index needs a second
+        # request for the checksum file of the artifact
+        remote_requests = remote_lookups + len(verifications)
+        wall_time = remote_requests / self._rate_limit if self._rate_limit > 0 else None
+        plan = {
+            'projects': len(projects),
+            'dependencies': len(dependencies),
+            'prefilled': prefilled,
+            'duplicates': len(dependencies) - prefilled - len(pending),
+            'hash_values': len(pending),
+            'cache_hits': cache_hits,
+            'skipped_internal': skipped,
+            'fingerprint_matches': fingerprint_matches,
+            'remote_lookups': remote_lookups,
+            'verifications': len(verifications),
+            'remote_requests': remote_requests,
+            'wall_time': wall_time,
+        }
+        logger.info('plan: %d projects, %d dependencies, %d pre-filled, %d duplicate hash values',
+                    plan['projects'], plan['dependencies'], plan['prefilled'], plan['duplicates'])
+        logger.info('plan: %d hash values to search, %d cache hits, %d internal jars skipped, %d remote lookups, '
+                    '%d fingerprint index matches used if not found online', plan['hash_values'], plan['cache_hits'],
+                    plan['skipped_internal'], plan['remote_lookups'], plan['fingerprint_matches'])
+        if self._verify:
+            logger.info('plan: %d pre-filled artifacts to verify online', plan['verifications'])
+        if self._cache is None:
+            logger.warning('plan: cache is disabled, every hash value is searched online')
+        if wall_time is None:
+            logger.warning('plan: at least %d remote requests, no rate limit configured, requests are only '
+                           'limited by %d workers', remote_requests, self._workers)
+        else:
+            logger.info('plan: at least %d remote requests, estimated wall time %s at %.1f requests/s',
+                        remote_requests, ProgressReporter.format_duration(wall_time), self._rate_limit)
+        return plan
+
+    def _collect_dependencies(self, hash_files):
+        """
+        Parse the hash files of projects.
+
+        :param hash_files: the lib-hash.csv files of the projects.
+        :return: a ``(projects, dependencies, verifications, pending)`` tuple,
+            where ``projects`` is a list of ``(hash_file, dependencies)``
+            tuples, ``verifications`` a dict of verification key to one of the
+            pre-filled dependencies with this key, and ``pending`` a dict of
+            the hash values to search to their first file name.
+        """
+        projects = []
+        for hash_file in hash_files:
+            # if report.csv found, parse hash values from this file directly
+            projects.append((hash_file, ProjectConfigFileUtils.parse_dependencies_from_csv(hash_file)))
+        dependencies = [dependency for _, project_dependencies in projects for dependency in project_dependencies]
+        verifications = {}
+        if self._verify:
+            for dependency in dependencies:
+                if dependency.get('found') == 'Y':
+                    verifications.setdefault(GavSearcher._verification_key(dependency), dependency)
+        pending = {}
         for dependency in dependencies:
-            filename = dependency['filename']
-            hash_value = dependency[SearchConstants.DEFAULT_HASH_NAME]
-            found = None
-            if "found" in dependency:
-                found = dependency["found"]
-            # check if artifact already found
-            if found == "Y":
-                self._dependencies.append(dependency)
-                key = GavSearcher.get_artifact_full_name(dependency)
-                if key not in self._artifacts:
-                    self._artifacts[key] = dependency
+            if dependency.get('found') != 'Y':
+                pending.setdefault(dependency[SearchConstants.DEFAULT_HASH_NAME], dependency['filename'])
+        return projects, dependencies, verifications, pending
+
+    def prefetch_artifacts(self, artifacts):
+        """
+        Download the sha1 hash values of artifacts and store them in the cache,
+        so that later searches of these artifacts are served locally.
+
+        :param artifacts: dicts with ``groupId``, ``artifactId``, ``version``,
+            ``packaging`` and ``classifier``.
+        :type artifacts: list
+        :return: the number of artifacts stored in the cache.
+        :rtype: int
+        """
+        if self._cache is None:
+            logger.error('cache is disabled, nothing to prefetch into')
+            return 0
+        logger.info('prefetching %d artifacts...', len(artifacts))
+        progress = ProgressReporter(total=len(artifacts), interval=self._progress_interval,
+                                    progress_file=self._progress_file)
+
+        def fetch(artifact):
+            coordinates = ':'.join([artifact['groupId'], artifact['artifactId'], artifact['version']])
+            try:
+                response = self._request_online(lambda attempt: self._online_client.get_artifact_sha1(
+                    group_id=artifact['groupId'], artifact_id=artifact['artifactId'], version=artifact['version'],
+                    packaging=artifact['packaging'], classifier=artifact['classifier'], attempt=attempt),
+                    coordinates)
+            except HttpClientAPIError as e:
+                logger.error('failed to prefetch %s, retried %d times, cause: %s', coordinates, self._retries, e)
+                progress.update(ProgressReporter.EXCEPTION)
+                return None
+            sha1 = GavSearchClient.parse_sha1_result(response)
+            if sha1 is None:
+                logger.debug('checksum of %s not found online', coordinates)
+                progress.update(ProgressReporter.MISS)
+                return None
+            progress.update(ProgressReporter.HIT)
+            return sha1, artifact['groupId'], artifact['artifactId'], artifact['version']
+
+        with ThreadPoolExecutor(max_workers=self._workers) as executor:
+            count = self._cache.put_many((result for result in executor.map(fetch, artifacts) if result is not None),
+                                         batch_size=self._batch_size)
+        progress.finish()
+        self._log_http_cache_statistics()
+        logger.info('prefetched %d artifacts into %s', count, self._cache.path)
+        return count
+
+    def _log_http_cache_statistics(self):
+        http_cache = self._online_client.http_cache
+        if http_cache is None:
+            return
+        statistics = http_cache.statistics()
+        logger.info('http cache: %d requests, %d hits, %d revalidated, hit ratio %.1f%%, %s not downloaded',
+                    statistics['requests'], statistics['hits'], statistics['revalidations'],
+                    statistics['hit_ratio'] * 100, StageProfiler.format_size(statistics['bytes_saved']))
+
+    def _search_hashes(self, pending, progress, profiler):
+        """
+        Search hash values concurrently, the most promising first.
+
+        Hash values found in the cache are returned first, followed by the
+        internal jars if they are only looked up locally, the jars named like
+        ``artifactId-version.jar``, the other jars and last the deferred
+        internal jars.
+
+        :param pending: dict of hash value to file name.
+        :param profiler: profiler of the searches in the worker threads.
+        :return: a generator of ``(hash_value, result)`` tuples, the searches in the order they complete.
+        """
+        cached = []
+        local = []
+        versioned = []
+        unversioned = []
+        deferred = []
+        for hash_value, filename in pending.items():
+            result = self._search_cache(hash_value, filename)
+            if result is not None:
+                cached.append((hash_value, result))
+            elif self._is_internal(filename) and self._skip_internal:
+                local.append((hash_value, filename, False))
+            elif self._is_internal(filename):
+                deferred.append((hash_value, filename, True))
+            elif GavSearcher.is_versioned_filename(filename):
+                versioned.append((hash_value, filename, True))
+            else:
+                unversioned.append((hash_value, filename, True))
+        logger.info('%d hash values found in cache, %d versioned, %d unversioned and %d internal jars to search',
+                    len(cached), len(versioned), len(unversioned), len(local) + len(deferred))
+        for hash_value, result in cached:
+            progress.update(ProgressReporter.HIT)
+            yield hash_value, result
+
+        def search(search_item):
+            hash_value, filename, online = search_item
+            result = self._search_dependency(hash_value, filename, online=online)
+            if len(result) > 0 and "found" in result and result['found']:
+                progress.update(ProgressReporter.HIT)
+            elif len(result) > 0 and "exception" in result and result['exception']:
+                progress.update(ProgressReporter.EXCEPTION)
             else:
-                result = self._search_dependency(hash_value, filename)
-                if len(result) > 0 and "found" in result and result['found']:
-                    self._dependencies.append(result)
-                    key = GavSearcher.get_artifact_full_name(result)
-                    if key not in self._artifacts:
-                        self._artifacts[key] = result
-                elif len(result) > 0 and "exception" in result and result['exception']:
-                    self._exception_dependencies.append(result)
+                progress.update(ProgressReporter.MISS)
+            return hash_value, result
+
+        with ThreadPoolExecutor(max_workers=self._workers) as executor:
+            # the completed futures are released by as_completed once yielded
+            for future in as_completed([executor.submit(profiler.wrap(search), search_item)
+                                        for search_item in local + versioned + unversioned + deferred]):
+                yield future.result()
+
+    def _write_project(self, output_directory, dependencies, results, lookups, searched_artifacts=None):
+        """
+        Write the reports and build files of a project.
+
+        The rows of the pre-filled and already searched dependencies are
+        written first, the other rows as soon as the search of their hash value
+        completes, so that a slow search does not hold back the following rows.
+        The build files list the artifacts in the order of the dependencies.
+
+        :param output_directory: the directory of the generated files.
+        :param dependencies: the dependencies of the project.
+        :param results: compact search results by hash value, the other results are taken from ``lookups``.
+        :param lookups: the generator returned by :py:meth:`_search_hashes`.
+        :param searched_artifacts: the registry of the artifacts of ``results``.
+        :type searched_artifacts: ArtifactRegistry
+        """
+        self._artifacts = ArtifactRegistry()
+        self._open_report_writers(output_directory)
+        # found artifacts by position of their dependency
+        artifacts = {}
+        # dependencies waiting for the search of their hash value, with their position
+        waiting = {}
+        try:
+            for position, dependency in enumerate(dependencies):
+                hash_value = dependency[SearchConstants.DEFAULT_HASH_NAME]
+                found = dependency.get('found')
+                # check if artifact already found
+                if found == "Y" and dependency.get('verified') is False:
+                    self._write_report(dependency, ReportWriter.MISMATCH)
+                elif found == "Y":
+                    # pre-filled rows are only cached once verified
+                    self._write_report(dependency, ReportWriter.FOUND)
+                    artifacts[position] = dependency
+                elif hash_value in results:
+                    result = GavSearcher._expand_result(hash_value, results[hash_value], searched_artifacts)
+                    artifacts[position] = self._write_result(dependency, result)
                 else:
-                    self._unknown_dependencies.append(dependency)
+                    waiting.setdefault(hash_value, []).append((position, dependency))
+            while len(waiting) > 0:
+                hash_value, result = next(lookups)
+                for position, dependency in waiting.pop(hash_value, []):
+                    artifacts[position] = self._write_result(dependency, result)
+        except BaseException:
+            for writer in self._report_writers:
+                writer.abort()
+            raise
+        for writer in self._report_writers:
+            writer.close()
+        for position in sorted(artifacts):
+            if artifacts[position] is not None:
+                self._register_artifact(artifacts[position])
+        self._generate_project_config_files(output_directory)
+
+    @staticmethod
+    def _compact_result(result, searched_artifacts):
+        """
+        Reduce a search result to what the reports need, to keep the results of
+        many hash values.
 
-    def _search_dependency(self, hash_value, filename):
-        result = self._search_online(hash_value, filename)
+        :param searched_artifacts: registry receiving the found artifact.
+        :return: a ``(found, artifact index, found_with, confidence)`` tuple,
+            ``found`` being one of the :py:class:`ReportWriter` values.
+        :rtype: tuple
+        """
+        if len(result) > 0 and "found" in result and result['found']:
+            index, _ = searched_artifacts.add(result['groupId'], result['artifactId'], result['version'])
+            return ReportWriter.FOUND, index, result.get('found_with', ''), result.get('confidence')
+        if len(result) > 0 and "exception" in result and result['exception']:
+            return ReportWriter.EXCEPTION, None, '', None
+        return ReportWriter.NOT_FOUND, None, '', None
+
+    @staticmethod
+    def _expand_result(hash_value, compact_result, searched_artifacts):
+        """
+        Rebuild the search result of a hash value from :py:meth:`_compact_result`.
+
+        :rtype: dict
+        """
+        found, index, found_with, confidence = compact_result
+        if found == ReportWriter.FOUND:
+            result = dict(searched_artifacts.get(index), found=True, found_with=found_with)
+            if confidence is not None:
+                result['confidence'] = confidence
+        elif found == ReportWriter.EXCEPTION:
+            result = {'found': False, 'exception': True}
+        else:
+            return {}
+        result[SearchConstants.DEFAULT_HASH_NAME] = hash_value
+        return result
+
+    def _write_result(self, dependency, result):
+        """
+        Write the report row of a searched dependency.
+
+        :return: the found artifact, ``None`` if not found.
+        :rtype: dict
+        """
+        if len(result) > 0 and "found" in result and result['found']:
+            result = dict(result, filename=dependency['filename'])
+            self._write_report(result, ReportWriter.FOUND)
+            return result
+        if len(result) > 0 and "exception" in result and result['exception']:
+            self._write_report(dict(result, filename=dependency['filename']), ReportWriter.EXCEPTION)
+        else:
+            self._write_report(dependency, ReportWriter.NOT_FOUND)
+        return None
+
+    def _open_report_writers(self, output_directory):
+        self._report_writers = []
+        try:
+            for output_format in self._output_formats:
+                writer_class = REPORT_WRITERS[output_format]
+                writer = writer_class(path=os.path.join(output_directory, writer_class.DEFAULT_FILENAME))
+                writer.open()
+                self._report_writers.append(writer)
+        except BaseException:
+            # discard the reports opened before the failing one
+            for writer in self._report_writers:
+                writer.abort()
+            self._report_writers = []
+            raise
+
+    def _write_report(self, dependency, found):
+        for writer in self._report_writers:
+            writer.write(dependency, found)
+
+    def _search_dependency(self, hash_value, filename, online=True):
+        result = self._search_cache(hash_value, filename)
+        if result is not None:
+            return result
+        result = self._search_online(hash_value, filename) if online else {}
         if len(result) > 0 and "found" in result and result['found']:
             result['found_with'] = 'online'
+            self._store_in_cache(result)
             return result
+        if len(result) == 0:
+            fingerprint_result = self._search_fingerprint(hash_value, filename)
+            if fingerprint_result is not None:
+                return fingerprint_result
         result['found_with'] = ''
         return result
 
-    def _search_online(self, hash_value, filename):
-        logging.getLogger(__name__).info('search online with %s %s', SearchConstants.DEFAULT_HASH_NAME, hash_value)
-        response = None
+    def _is_internal(self, filename):
+        return GavSearcher.get_basename(filename).lower().startswith(self._internal_prefixes)
+
+    @staticmethod
+    def is_versioned_filename(filename):
+        return GavSearcher.VERSIONED_FILENAME_PATTERN.match(GavSearcher.get_basename(filename)) is not None
+
+    @staticmethod
+    def get_basename(filename):
+        # nested archives are named like app.war!/WEB-INF/lib/x.jar
+        return filename.replace('\\', '/').rsplit('/', 1)[-1]
+
+    def _search_cache(self, hash_value, filename):
+        if self._cache is None:
+            return None
+        try:
+            result = self._cache.get(hash_value)
+        except (OSError, sqlite3.Error) as e:
+            logger.warning('failed to search %s in cache, cause: %s', hash_value, e)
+            return None
+        if result is None:
+            return None
+        logger.debug('hash %s found in cache, artifact: %s', hash_value, result)
+        result['filename'] = filename
+        result['found'] = True
+        result['found_with'] = 'cache'
+        result[SearchConstants.DEFAULT_HASH_NAME] = hash_value
+        return result
+
+    def _search_fingerprint(self, hash_value, filename):
+        if self._fingerprint_index is None:
+            return None
+        if not os.path.isfile(filename.split(ArchiveScanner.NESTED_SEPARATOR)[0]):
+            return None
+        try:
+            with ArchiveScanner.open_archive(filename) as jar_file:
+                signature = JarFingerprint.calculate_signature(jar_file)
+        except (OSError, KeyError, zipfile.BadZipFile) as e:
+            logger.warning('failed to fingerprint %s, cause: %s', filename, e)
+            return None
+        if signature is None:
+            return None
+        match = self._fingerprint_index.find_best_match(signature, self._fingerprint_threshold)
+        if match is None:
+            return None
+        result, confidence = match
+        logger.debug('hash %s matched by fingerprint, artifact: %s, confidence: %.2f',
+                     hash_value, result, confidence)
+        result['filename'] = filename
+        result['found'] = True
+        result['found_with'] = 'fingerprint'
+        result['confidence'] = confidence
+        result[SearchConstants.DEFAULT_HASH_NAME] = hash_value
+        return result
+
+    def _store_in_cache(self, artifact):
+        if self._cache is None:
+            return
+        if not artifact['groupId'] or not artifact['artifactId'] or not artifact['version']:
+            return
+        try:
+            self._cache.put(artifact[SearchConstants.DEFAULT_HASH_NAME],
+                            group_id=artifact['groupId'],
+                            artifact_id=artifact['artifactId'],
+                            version=artifact['version'])
+        except (OSError, sqlite3.Error) as e:
+            logger.warning('failed to store %s in cache, cause: %s', artifact[SearchConstants.DEFAULT_HASH_NAME], e)
+
+    def _verify_dependencies(self, verifications, progress, profiler):
+        """
+        Verify pre-filled artifacts concurrently.
+
+        :param verifications: dict of verification key to one of the dependencies with this key.
+        :param profiler: profiler of the verifications in the worker threads.
+        :return: dict of verification key to the result of :py:meth:`_verify_dependency`.
+        """
+        logger.info('verifying %d pre-filled artifacts...', len(verifications))
+
+        def verify(dependency):
+            verified = self._verify_dependency(dependency)
+            if verified is None:
+                progress.update(ProgressReporter.EXCEPTION)
+            else:
+                progress.update(ProgressReporter.HIT if verified else ProgressReporter.MISMATCH)
+            return verified
+
+        with ThreadPoolExecutor(max_workers=self._verify_workers) as executor:
+            results = dict(zip(verifications.keys(), executor.map(profiler.wrap(verify), verifications.values())))
+        mismatches = sum(1 for verified in results.values() if verified is False)
+        logger.info('verified %d pre-filled artifacts, %d mismatches', len(results), mismatches)
+        return results
+
+    @staticmethod
+    def _verification_key(dependency):
+        return (dependency[SearchConstants.DEFAULT_HASH_NAME], dependency['groupId'], dependency['artifactId'],
+                dependency['version'])
+
+    def _verify_dependency(self, dependency):
+        """
+        Check that the pre-filled artifact of a dependency exists and that its hash value matches.
+
+        The local cache is not used, as it may hold artifacts pre-filled by an
+        earlier run. The hash value is searched online first, if the search
+        index does not know it, it is compared with the checksum file of the
+        pre-filled artifact.
+
+        :return: ``True`` if verified, ``False`` on mismatch, ``None`` if the backend could not be reached.
+        """
+        hash_value = dependency[SearchConstants.DEFAULT_HASH_NAME]
+        expected = {'groupId': dependency['groupId'],
+                    'artifactId': dependency['artifactId'],
+                    'version': dependency['version']}
+        try:
+            response = self._request_online(
+                lambda attempt: self._online_client.search_with_sha1(hash_value, attempt=attempt), hash_value)
+            # several artifacts may share the hash value, the oldest one is not necessarily the pre-filled one
+            artifacts = GavSearchClient.parse_online_search_results(response)
+            if expected in artifacts:
+                self._store_in_cache(dependency)
+                return True
+            if len(artifacts) > 0:
+                logger.warning('hash %s mismatch, artifacts %s were found instead of %s', hash_value, artifacts,
+                               expected)
+                return False
+            response = self._request_online(lambda attempt: self._online_client.get_artifact_sha1(
+                group_id=expected['groupId'], artifact_id=expected['artifactId'], version=expected['version'],
+                attempt=attempt), hash_value)
+        except HttpClientAPIError as e:
+            logger.error('failed to verify %s online, retried %d times, cause: %s', hash_value, self._retries, e)
+            return None
+        if response.status_code == 404:
+            logger.warning('hash %s mismatch, artifact %s does not exist', hash_value, expected)
+            return False
+        sha1 = GavSearchClient.parse_sha1_result(response)
+        if sha1 is None:
+            logger.error('failed to verify %s, invalid checksum file of artifact %s, status %d', hash_value,
+                         expected, response.status_code)
+            return None
+        if sha1 != hash_value.lower():
+            logger.warning('hash %s mismatch, artifact %s has the hash value %s', hash_value, expected, sha1)
+            return False
+        self._store_in_cache(dependency)
+        return True
+
+    def _request_online(self, request, hash_value):
         retry_count = 0
-        while response is None:
+        while True:
+            self._rate_limiter.acquire()
             try:
-                response = self._online_client.search_with_sha1(hash_value)
-                break
-            except HttpClientAPIError as e:
-                logging.getLogger(__name__).warning('timed out when finding hash %s online', hash_value)
+                return request(retry_count + 1)
+            except CassetteMissException:
+                raise
+            except HttpClientAPIError:
+                logger.warning('timed out when finding %s online', hash_value)
                 retry_count += 1
                 if retry_count > self._retries:
-                    result = dict()
-                    result['filename'] = filename
-                    result['found'] = False
-                    result['exception'] = True
-                    result[SearchConstants.DEFAULT_HASH_NAME] = hash_value
-                    logging.getLogger(__name__).error('failed to find %s online, retried % times, cause: %s',
-                                                      hash_value, self._retries, e)
-                    return result
+                    raise
+
+    def _search_online(self, hash_value, filename):
+        logger.debug('search online with %s %s', SearchConstants.DEFAULT_HASH_NAME, hash_value)
+        try:
+            response = self._request_online(
+                lambda attempt: self._online_client.search_with_sha1(hash_value, attempt=attempt), hash_value)
+        except HttpClientAPIError as e:
+            result = dict()
+            result['filename'] = filename
+            result['found'] = False
+            result['exception'] = True
+            result[SearchConstants.DEFAULT_HASH_NAME] = hash_value
+            logger.error('failed to find %s online, retried %d times, cause: %s', hash_value, self._retries, e)
+            return result
         parsed_result = GavSearchClient.parse_online_search_result(response)
         if parsed_result is not None:
-            logging.getLogger(__name__).info('hash %s found online, artifact: %s', hash_value, parsed_result)
+            logger.debug('hash %s found online, artifact: %s', hash_value, parsed_result)
             parsed_result['filename'] = filename
             parsed_result['found'] = True
             parsed_result[SearchConstants.DEFAULT_HASH_NAME] = hash_value
             return parsed_result
-        logging.getLogger(__name__).warning('artifact %s not found online', hash_value)
+        logger.debug('artifact %s not found online', hash_value)
         return {}
 
-    def _generate_project_config_files(self):
-        dependencies = self._artifacts.values()
-        ProjectConfigFileUtils.generate_maven_config(dependencies)
-        ProjectConfigFileUtils.generate_gradle_config(dependencies)
-        ProjectConfigFileUtils.generate_ant_config(dependencies)
-
-    def _generate_report(self):
-        logging.getLogger(__name__).info('generating report.csv...')
-        with open(self._report_file, 'w', newline='', encoding='utf-8') as csv_file:
-            writer = csv.writer(csv_file)
-            writer.writerow(['File Name', SearchConstants.DEFAULT_HASH_NAME, 'Found', 'Found With', 'Group Id',
-                             'Artifact Id', 'Version'])
-            for dependency in self._dependencies:
-                writer.writerow([
-                    dependency['filename'],
-                    dependency[SearchConstants.DEFAULT_HASH_NAME],
-                    'Y',  # Found
-                    dependency['found_with'],
-                    dependency['groupId'],
-                    dependency['artifactId'],
-                    dependency['version']
-                ])
-            for dependency in self._exception_dependencies:
-                writer.writerow([
-                    dependency['filename'],
-                    dependency[SearchConstants.DEFAULT_HASH_NAME],
-                    'Exception',  # Found
-                    '',  # Found With
-                    '',  # groupId
-                    '',  # artifactId
-                    ''  # version
-                ])
-            for dependency in self._unknown_dependencies:
-                writer.writerow([
-                    dependency['filename'],
-                    dependency[SearchConstants.DEFAULT_HASH_NAME],
-                    'N',  # Found
-                    '',  # Found With
-                    '',  # groupId
-                    '',  # artifactId
-                    ''  # version
-                ])
+    def _register_artifact(self, dependency):
+        """
+        Add the artifact of a found dependency to the project.
 
-    @staticmethod
-    def get_artifact_full_name(artifact_map):
-        return artifact_map['groupId'] + artifact_map['artifactId'] + artifact_map['version']
+        :return: True if the artifact was not yet in the project.
+        :rtype: bool
+        """
+        _, is_new = self._artifacts.add(dependency['groupId'], dependency['artifactId'], dependency['version'])
+        return is_new
+
+    def _generate_project_config_files(self, output_directory):
+        dependencies = self._artifacts
+        ProjectConfigFileUtils.generate_maven_config(dependencies, os.path.join(output_directory, "pom.xml"))
+        ProjectConfigFileUtils.generate_gradle_config(dependencies, os.path.join(output_directory, "build.gradle"))
+        ProjectConfigFileUtils.generate_ant_config(dependencies, os.path.join(output_directory, "build.xml"))
@@ -0,0 +1,284 @@
+#  The MIT License (MIT)
+#
+#  Copyright (c) 2021. Scott Lau
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#  SOFTWARE.
+
+import datetime
+import email.utils
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from .cassette import Cassette
+
+
+class HttpCache(object):
+    """
+    A private on-disk HTTP cache of GET responses kept in a sqlite file.
+
+    Responses are keyed like cassette entries, by the method and the url with
+    its query parameters in sorted order. A response is stored when it is
+    fresh for some time according to its ``Cache-Control: max-age`` or
+    ``Expires`` headers, or when it carries an ``ETag`` or ``Last-Modified``
+    validator. Fresh responses are served without any request, stale ones are
+    revalidated with ``If-None-Match`` and ``If-Modified-Since`` and served
+    from the cache when the server answers ``304 Not Modified``.
+
+    Args:
+        path (str): path of the cache file.
+    """
+    CACHED_METHODS = ('GET',)
+    CACHEABLE_STATUSES = (200, 203, 300, 301, 404, 410)
+    # only the response headers replaced by a 304 response
+    REVALIDATED_HEADERS = ('cache-control', 'date', 'etag', 'expires', 'last-modified')
+
+    def __init__(self, *, path):
+        self._path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, "
+            "status INTEGER NOT NULL, "
+            "headers TEXT NOT NULL, "
+            "body BLOB NOT NULL, "
+            "expires REAL NOT NULL)")
+        self._connection.commit()
+        self._statistics_lock = threading.Lock()
+        self._hits = 0
+        self._revalidations = 0
+        self._misses = 0
+        self._bytes_saved = 0
+
+    @property
+    def path(self):
+        """
+        Path of the cache file.
+
+        :rtype: str
+        """
+        return self._path
+
+    def request(self, send, method, url, **kwargs):
+        """
+        Serve a request from the cache, revalidate a stale response, or send
+        the request and store its response.
+
+        :param send: called with ``kwargs``, including the conditional headers,
+            to send the request, returns a :py:class:`requests.Response`.
+        :param method: the http method.
+        :param url: the url without query parameters of ``kwargs``.
+        :param kwargs: as per :py:func:`requests.request`.
+        :rtype: requests.Response
+        """
+        if method.upper() not in HttpCache.CACHED_METHODS:
+            return send(**kwargs)
+        key = Cassette.request_key(method, url, kwargs.get('params'))
+        entry = self._load(key)
+        if entry is not None and entry['expires'] > time.time():
+            self._count(hits=1, bytes_saved=len(entry['body']))
+            return HttpCache._build_response(entry, method, url, kwargs.get('params'))
+        if entry is not None:
+            kwargs['headers'] = dict(kwargs.get('headers') or {}, **HttpCache._conditional_headers(entry['headers']))
+        response = send(**kwargs)
+        if entry is not None and response.status_code == 304:
+            response.close()
+            for name, value in response.headers.items():
+                if name.lower() in HttpCache.REVALIDATED_HEADERS:
+                    entry['headers'][name] = value
+            entry['expires'] = time.time() + (HttpCache.freshness_lifetime(entry['headers']) or 0)
+            self._save(key, entry)
+            self._count(revalidations=1, bytes_saved=len(entry['body']))
+            logging.getLogger(__name__).debug('revalidated cached response of %s', key)
+            return HttpCache._build_response(entry, method, url, kwargs.get('params'))
+        self._count(misses=1)
+        self._store(key, response)
+        return response
+
+    def _store(self, key, response):
+        if response.status_code not in HttpCache.CACHEABLE_STATUSES:
+            return
+        lifetime = HttpCache.freshness_lifetime(response.headers)
+        if lifetime is None:
+            return
+        has_validator = 'ETag' in response.headers or 'Last-Modified' in response.headers
+        if lifetime <= 0 and not has_validator:
+            return
+        # responses varying on other request headers than the negotiated encoding are never shared
+        vary = {name.strip().lower() for name in response.headers.get('Vary', '').split(',') if name.strip()}
+        if vary - {'accept-encoding'}:
+            return
+        headers = CaseInsensitiveDict({name: value for name, value in response.headers.items()
+                                       if name.lower() not in Cassette.SKIPPED_HEADERS})
+        self._save(key, {
+            'status': response.status_code,
+            'headers': headers,
+            'body': response.content,
+            'expires': time.time() + lifetime,
+        })
+        logging.getLogger(__name__).debug('cached response of %s for %d seconds', key, lifetime)
+
+    def _load(self, key):
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT status, headers, body, expires FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        status, headers, body, expires = row
+        return {
+            'status': status,
+            'headers': CaseInsensitiveDict(json.loads(headers)),
+            'body': zlib.decompress(body),
+            'expires': expires,
+        }
+
+    def _save(self, key, entry):
+        with self._lock:
+            with self._connection:
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO responses (key, status, headers, body, expires) VALUES (?, ?, ?, ?, ?)",
+                    (key, entry['status'], json.dumps(dict(entry['headers'].items())), zlib.compress(entry['body']),
+                     entry['expires']))
+
+    def _count(self, hits=0, revalidations=0, misses=0, bytes_saved=0):
+        with self._statistics_lock:
+            self._hits += hits
+            self._revalidations += revalidations
+            self._misses += misses
+            self._bytes_saved += bytes_saved
+
+    def statistics(self):
+        """
+        Counters of the requests handled since the cache was opened.
+
+        :return: a dict with the ``requests``, ``hits`` served without any
+            request, ``revalidations`` answered by ``304 Not Modified``,
+            ``misses``, the ``hit_ratio`` of hits and revalidations, and the
+            body ``bytes_saved``.
+        :rtype: dict
+        """
+        with self._statistics_lock:
+            requests_count = self._hits + self._revalidations + self._misses
+            return {
+                'requests': requests_count,
+                'hits': self._hits,
+                'revalidations': self._revalidations,
+                'misses': self._misses,
+                'hit_ratio': (self._hits + self._revalidations) / requests_count if requests_count > 0 else 0.0,
+                'bytes_saved': self._bytes_saved,
+            }
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+    @staticmethod
+    def freshness_lifetime(headers):
+        """
+        Number of seconds a response stays fresh from now.
+
+        :param headers: the response headers.
+        :return: the lifetime, ``0`` if the response must be revalidated before
+            each use, ``None`` if it must not be stored.
+        :rtype: float
+        """
+        directives = HttpCache.parse_cache_control(headers.get('Cache-Control', ''))
+        if 'no-store' in directives:
+            return None
+        if 'no-cache' in directives:
+            return 0
+        lifetime = None
+        for directive in ('s-maxage', 'max-age'):
+            if directive in directives:
+                try:
+                    lifetime = int(directives[directive])
+                    break
+                except (TypeError, ValueError):
+                    return 0
+        if lifetime is None:
+            if 'Expires' not in headers:
+                return 0
+            expires = HttpCache._parse_date(headers['Expires'])
+            date = HttpCache._parse_date(headers.get('Date')) or time.time()
+            # an invalid date such as 0 means already expired
+            lifetime = expires - date if expires is not None else 0
+        try:
+            age = int(headers.get('Age', 0))
+        except ValueError:
+            age = 0
+        return max(0, lifetime - age)
+
+    @staticmethod
+    def parse_cache_control(value):
+        """
+        Parse a ``Cache-Control`` header.
+
+        :return: a dict of lower case directive names to their values, ``None``
+            for directives without value.
+        :rtype: dict
+        """
+        directives = {}
+        for directive in value.split(','):
+            name, _, argument = directive.strip().partition('=')
+            if name:
+                directives[name.lower()] = argument.strip('"') if argument else None
+        return directives
+
+    @staticmethod
+    def _parse_date(value):
+        if not value:
+            return None
+        try:
+            return email.utils.parsedate_to_datetime(value).timestamp()
+        except (TypeError, ValueError, IndexError):
+            return None
+
+    @staticmethod
+    def _conditional_headers(headers):
+        conditional_headers = {}
+        if 'ETag' in headers:
+            conditional_headers['If-None-Match'] = headers['ETag']
+        if 'Last-Modified' in headers:
+            conditional_headers['If-Modified-Since'] = headers['Last-Modified']
+        return conditional_headers
+
+    @staticmethod
+    def _build_response(entry, method, url, params):
+        response = requests.Response()
+        response.status_code = entry['status']
+        response.headers = CaseInsensitiveDict(entry['headers'])
+        response._content = entry['body']
+        # the body is already read, so that streamed responses can be iterated
+        response._content_consumed = True
+        response.elapsed = datetime.timedelta(0)
+        response.request = requests.Request(method=method.upper(), url=url, params=params).prepare()
+        response.url = response.request.url
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        return response
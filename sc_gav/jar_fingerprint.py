@@ -0,0 +1,255 @@
+#  The MIT License (MIT)
+#
+#  Copyright (c) 2021. Scott Lau
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#  SOFTWARE.
+
+import hashlib
+import logging
+import os
+import random
+import sqlite3
+import struct
+import threading
+import zipfile
+
+_MERSENNE_PRIME = (1 << 61) - 1
+
+
+def _generate_permutations(count, seed=20210304):
+    generator = random.Random(seed)
+    return [(generator.randint(1, _MERSENNE_PRIME - 1), generator.randint(0, _MERSENNE_PRIME - 1))
+            for _ in range(count)]
+
+
+class JarFingerprint:
+    """
+    MinHash fingerprints of jars built from the CRCs of their class entries.
+
+    The CRCs are read from the zip central directory, so no entry is decompressed.
+    Two jars that share most of their classes, e.g. a jar that was re-signed,
+    stripped of its manifest or repackaged, get similar signatures even though
+    their sha1 values differ.
+    """
+    NUM_PERMUTATIONS = 64
+    # LSH bands, each band hashes NUM_PERMUTATIONS // BANDS signature rows
+    BANDS = 16
+    _MAX_HASH = (1 << 32) - 1
+    _PERMUTATIONS = _generate_permutations(NUM_PERMUTATIONS)
+    _SIGNATURE_FORMAT = '>{0}Q'.format(NUM_PERMUTATIONS)
+
+    def __init__(self):
+        pass
+
+    @staticmethod
+    def class_crcs(file_path_or_handle):
+        """
+        Read the sorted set of class entry CRCs of a jar.
+
+        :param file_path_or_handle: the jar file name or a seekable file handle.
+        :return: the sorted CRCs, empty if the jar contains no classes.
+        :rtype: list
+        """
+        with zipfile.ZipFile(file_path_or_handle) as jar:
+            crcs = {info.CRC for info in jar.infolist() if info.filename.endswith('.class')}
+        return sorted(crcs)
+
+    @staticmethod
+    def calculate_signature(file_path_or_handle):
+        """
+        Calculate the MinHash signature of a jar.
+
+        :param file_path_or_handle: the jar file name or a seekable file handle.
+        :return: the signature, ``None`` if the jar contains no classes.
+        :rtype: tuple
+        """
+        crcs = JarFingerprint.class_crcs(file_path_or_handle)
+        if len(crcs) == 0:
+            return None
+        prime = _MERSENNE_PRIME
+        max_hash = JarFingerprint._MAX_HASH
+        return tuple(min((a * crc + b) % prime & max_hash for crc in crcs)
+                     for a, b in JarFingerprint._PERMUTATIONS)
+
+    @staticmethod
+    def similarity(signature, other_signature):
+        """
+        Estimate the Jaccard similarity of the class sets of two jars.
+
+        :rtype: float
+        """
+        same = sum(1 for value, other_value in zip(signature, other_signature) if value == other_value)
+        return same / JarFingerprint.NUM_PERMUTATIONS
+
+    @staticmethod
+    def band_buckets(signature):
+        """
+        Hash each LSH band of a signature into a bucket.
+
+        :return: a list of ``(band, bucket)`` tuples.
+        :rtype: list
+        """
+        rows = JarFingerprint.NUM_PERMUTATIONS // JarFingerprint.BANDS
+        buckets = []
+        for band in range(JarFingerprint.BANDS):
+            band_bytes = struct.pack('>{0}Q'.format(rows), *signature[band * rows:(band + 1) * rows])
+            bucket = int.from_bytes(hashlib.blake2b(band_bytes, digest_size=8).digest(), 'big', signed=True)
+            buckets.append((band, bucket))
+        return buckets
+
+    @staticmethod
+    def pack(signature):
+        return struct.pack(JarFingerprint._SIGNATURE_FORMAT, *signature)
+
+    @staticmethod
+    def unpack(signature_bytes):
+        return struct.unpack(JarFingerprint._SIGNATURE_FORMAT, signature_bytes)
+
+
+class FingerprintIndex(object):
+    """
+    A local index of jar fingerprints, queried through MinHash LSH buckets so
+    that a lookup only compares the signatures sharing at least one band.
+
+    Args:
+        path (str): path of the sqlite database file.
+    """
+
+    def __init__(self, *, path):
+        self._path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS fingerprints ("
+                "id INTEGER PRIMARY KEY, "
+                "group_id TEXT NOT NULL, "
+                "artifact_id TEXT NOT NULL, "
+                "version TEXT NOT NULL, "
+                "signature BLOB NOT NULL, "
+                "UNIQUE (group_id, artifact_id, version))")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS buckets ("
+                "band INTEGER NOT NULL, "
+                "bucket INTEGER NOT NULL, "
+                "fingerprint_id INTEGER NOT NULL)")
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS buckets_band_bucket ON buckets (band, bucket)")
+
+    @property
+    def path(self):
+        """
+        Path of the index database.
+
+        :rtype: str
+        """
+        return self._path
+
+    def add_many(self, fingerprints):
+        """
+        Add fingerprints in a single transaction, replacing existing ones.
+
+        :param fingerprints: iterable of ``(groupId, artifactId, version, signature)`` tuples.
+        :return: the number of fingerprints added.
+        :rtype: int
+        """
+        count = 0
+        with self._lock:
+            with self._connection:
+                for group_id, artifact_id, version, signature in fingerprints:
+                    row = self._connection.execute(
+                        "SELECT id FROM fingerprints WHERE group_id = ? AND artifact_id = ? AND version = ?",
+                        (group_id, artifact_id, version)).fetchone()
+                    if row is not None:
+                        self._connection.execute("DELETE FROM buckets WHERE fingerprint_id = ?", (row[0],))
+                        self._connection.execute("DELETE FROM fingerprints WHERE id = ?", (row[0],))
+                    cursor = self._connection.execute(
+                        "INSERT INTO fingerprints (group_id, artifact_id, version, signature) VALUES (?, ?, ?, ?)",
+                        (group_id, artifact_id, version, JarFingerprint.pack(signature)))
+                    self._connection.executemany(
+                        "INSERT INTO buckets (band, bucket, fingerprint_id) VALUES (?, ?, ?)",
+                        [(band, bucket, cursor.lastrowid) for band, bucket in JarFingerprint.band_buckets(signature)])
+                    count += 1
+        return count
+
+    def find_best_match(self, signature, threshold):
+        """
+        Find the indexed artifact most similar to the given signature.
+
+        :param signature: the MinHash signature of the jar.
+        :param threshold: minimum estimated similarity of a match.
+        :type threshold: float
+        :return: a ``(artifact, confidence)`` tuple, ``None`` if no candidate reaches the threshold.
+        :rtype: tuple
+        """
+        best = None
+        with self._lock:
+            candidate_ids = set()
+            for band, bucket in JarFingerprint.band_buckets(signature):
+                rows = self._connection.execute(
+                    "SELECT fingerprint_id FROM buckets WHERE band = ? AND bucket = ?", (band, bucket))
+                candidate_ids.update(row[0] for row in rows)
+            for candidate_id in candidate_ids:
+                row = self._connection.execute(
+                    "SELECT group_id, artifact_id, version, signature FROM fingerprints WHERE id = ?",
+                    (candidate_id,)).fetchone()
+                confidence = JarFingerprint.similarity(signature, JarFingerprint.unpack(row[3]))
+                if confidence >= threshold and (best is None or confidence > best[1]):
+                    best = ({'groupId': row[0], 'artifactId': row[1], 'version': row[2]}, confidence)
+        return best
+
+    def index_maven_repository(self, root_directory):
+        """
+        Fingerprint every ``artifactId-version.jar`` of a Maven repository
+        layout such as ``~/.m2/repository``.
+
+        :param root_directory: the root of the repository.
+        :return: the number of fingerprints added.
+        :rtype: int
+        """
+        normalized_directory = os.path.normpath(root_directory)
+        logging.getLogger(__name__).info('index fingerprints of %s', normalized_directory)
+        return self.add_many(FingerprintIndex._scan_maven_repository(normalized_directory))
+
+    @staticmethod
+    def _scan_maven_repository(root_directory):
+        for directory, _, filenames in os.walk(root_directory):
+            parts = os.path.relpath(directory, root_directory).split(os.sep)
+            if len(parts) < 3:
+                continue
+            group_id = '.'.join(parts[:-2])
+            artifact_id = parts[-2]
+            version = parts[-1]
+            filename = '{0}-{1}.jar'.format(artifact_id, version)
+            if filename not in filenames:
+                continue
+            try:
+                signature = JarFingerprint.calculate_signature(os.path.join(directory, filename))
+            except (OSError, zipfile.BadZipFile) as e:
+                logging.getLogger(__name__).warning('failed to fingerprint %s, cause: %s', filename, e)
+                continue
+            if signature is not None:
+                yield group_id, artifact_id, version, signature
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
@@ -20,13 +20,22 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
+import argparse
 import logging
+import os
 
 from scutils import Singleton
 from scutils import log_init
 
 from sc_gav.utils import config
+from .archive_scanner import ArchiveScanner
+from .exception import InvalidConfigurationException
+from .gav_cache_importer import GavCacheImporter
+from .gav_list_parser import GavListParser
 from .gav_searcher import GavSearcher
+from .jar_fingerprint import FingerprintIndex
+from .profiler import StageProfiler
+from .settings import Settings
 from sc_hash.hash_utils import HashUtils
 
 
@@ -35,7 +44,7 @@ class Runner(metaclass=Singleton):
     def __init__(self):
         self._gav_searcher = GavSearcher()
 
-    def run(self):
+    def run(self, plan=False, profiler=None):
         dev_mode = False
         try:
             dev_mode = config.get("dev.dev_mode")
@@ -47,16 +56,120 @@ class Runner(metaclass=Singleton):
         if lib_paths is not None:
             for lib_path in lib_paths:
                 libs.add(lib_path)
+        if profiler is None:
+            profiler = StageProfiler()
         if len(libs) > 0:
-            HashUtils.generate_hash(libs)
-        self._gav_searcher.search_dependency_gav()
+            with profiler.stage('hashing'):
+                if Settings().scan_nested_archives:
+                    ArchiveScanner.generate_hash(libs, workers=Settings().scan_workers, profiler=profiler)
+                else:
+                    HashUtils.generate_hash(libs)
+        if plan:
+            self._gav_searcher.plan_dependency_gav()
+        else:
+            self._gav_searcher.search_dependency_gav(profiler=profiler)
+        return 0
+
+    def run_batch(self, paths, plan=False, profiler=None):
+        hash_files = []
+        for path in paths:
+            if os.path.isdir(path):
+                hash_files.append(os.path.join(path, 'lib-hash.csv'))
+            else:
+                hash_files.append(path)
+        hash_files_by_directory = {}
+        for hash_file in hash_files:
+            directory = os.path.realpath(os.path.dirname(hash_file) or '.')
+            if directory in hash_files_by_directory:
+                # the reports and build files of a project are written in the directory of its hash file
+                logging.getLogger(__name__).error('%s and %s are in the same directory, their reports would '
+                                                  'overwrite each other', hash_files_by_directory[directory],
+                                                  hash_file)
+                return 1
+            hash_files_by_directory[directory] = hash_file
+        if plan:
+            self._gav_searcher.plan_projects(hash_files)
+        else:
+            self._gav_searcher.search_projects(hash_files, profiler=profiler)
+        return 0
+
+    def import_cache(self, paths):
+        cache = self._gav_searcher.cache
+        if cache is None:
+            logging.getLogger(__name__).error('cache is disabled, nothing to import into')
+            return 1
+        GavCacheImporter.import_files(cache, paths, batch_size=self._gav_searcher.batch_size)
+        return 0
+
+    def prefetch(self, paths):
+        artifacts = GavListParser.parse_files(paths)
+        self._gav_searcher.prefetch_artifacts(artifacts)
+        return 0
+
+    @staticmethod
+    def index_fingerprints(paths):
+        index = FingerprintIndex(path=Settings().fingerprint_index_path)
+        try:
+            for path in paths:
+                count = index.index_maven_repository(path)
+                logging.getLogger(__name__).info('indexed %d fingerprints from %s', count, path)
+        finally:
+            index.close()
         return 0
 
 
+def parse_args(args=None):
+    parser = argparse.ArgumentParser(prog='sc-search-gav',
+                                     description='search GAV(groupId artifactId and version) using hash values',
+                                     fromfile_prefix_chars='@')
+    parser.add_argument('--plan', action='store_true',
+                        help='estimate cache hits, remote requests and wall time without searching online')
+    parser.add_argument('--profile', choices=StageProfiler.MODES,
+                        help='profile the cpu time or the memory allocations of the hashing, parsing, lookup and '
+                             'output stages')
+    parser.add_argument('--profile-dir', help='directory of the profile files, defaults to "."')
+    subparsers = parser.add_subparsers(dest='command')
+    batch_parser = subparsers.add_parser('batch', help='search several projects with shared lookups')
+    batch_parser.add_argument('paths', nargs='+',
+                              help='project directories containing lib-hash.csv, or hash files; '
+                                   'use @file to read the paths from a file, one per line')
+    import_parser = subparsers.add_parser('import', help='import resolved artifacts into the local cache')
+    import_parser.add_argument('paths', nargs='+',
+                               help='report.csv, jsonl or "sha1  groupId:artifactId:version" files or directories')
+    prefetch_parser = subparsers.add_parser('prefetch', help='fill the local cache with the hash values of artifacts')
+    prefetch_parser.add_argument('paths', nargs='+',
+                                 help='pom.xml files, directories containing pom.xml files, or files listing '
+                                      'groupId:artifactId[:packaging[:classifier]]:version coordinates')
+    index_parser = subparsers.add_parser('index', help='index jar fingerprints of local Maven repositories')
+    index_parser.add_argument('paths', nargs='+', help='Maven repository directories, e.g. ~/.m2/repository')
+    parsed_args = parser.parse_args(args)
+    # only searches can be planned or profiled
+    if parsed_args.command not in (None, 'batch'):
+        for option, value in (('--plan', parsed_args.plan), ('--profile', parsed_args.profile),
+                              ('--profile-dir', parsed_args.profile_dir)):
+            if value:
+                parser.error('{0} is not supported by the {1} command'.format(option, parsed_args.command))
+    return parsed_args
+
+
 def main():
+    args = parse_args()
     try:
         log_init()
-        state = Runner().run()
+        profiler = StageProfiler(mode=args.profile, output_directory=args.profile_dir or '.')
+        if args.command == 'batch':
+            state = Runner().run_batch(args.paths, plan=args.plan, profiler=profiler)
+        elif args.command == 'import':
+            state = Runner().import_cache(args.paths)
+        elif args.command == 'prefetch':
+            state = Runner().prefetch(args.paths)
+        elif args.command == 'index':
+            state = Runner.index_fingerprints(args.paths)
+        else:
+            state = Runner().run(plan=args.plan, profiler=profiler)
+    except InvalidConfigurationException as e:
+        logging.getLogger(__name__).error('invalid configuration: %s', e)
+        return 1
     except Exception as e:
         logging.getLogger(__name__).exception('An error occurred.', exc_info=e)
         return 1
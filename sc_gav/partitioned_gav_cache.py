@@ -0,0 +1,257 @@
+#  The MIT License (MIT)
+#
+#  Copyright (c) 2021. Scott Lau
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#  SOFTWARE.
+
+import logging
+import mmap
+import os
+import threading
+import time
+
+from .gav_cache import GavCache
+
+try:
+    import fcntl
+except ImportError:
+    # advisory locks are not available on Windows, writers are then only serialized within the process
+    fcntl = None
+
+
+class PartitionedGavCache(object):
+    """
+    A local sha1 to GAV lookup store partitioned by the first byte of the
+    hash value into 256 append-only segment files.
+
+    Each record is one ``sha1<TAB>groupId<TAB>artifactId<TAB>version<TAB>updated``
+    line, the last record of a hash value wins. A lookup maps only the segment
+    of its hash value while holding a shared advisory lock on its ``.lock``
+    file, writers append to a segment while holding an exclusive lock on it, so
+    lookups and writers of different segments never contend. A segment is
+    compacted by its writer once it grows past twice its size after the
+    previous compaction, the segment file is replaced while no other process
+    maps it.
+
+    The interface is the same as :py:class:`sc_gav.gav_cache.GavCache`.
+
+    Args:
+        path (str): directory of the segment files.
+        compact_size (int): minimum size in bytes of a segment before it is compacted.
+        ttl (float): seconds after which a stored artifact expires, ``0`` for never.
+    """
+    DEFAULT_BATCH_SIZE = GavCache.DEFAULT_BATCH_SIZE
+    DEFAULT_COMPACT_SIZE = 1024 * 1024
+    SEGMENT_EXTENSION = '.seg'
+    LOCK_EXTENSION = '.lock'
+    FIELD_SEPARATOR = '\t'
+
+    def __init__(self, *, path, compact_size=DEFAULT_COMPACT_SIZE, ttl=0):
+        self._path = path
+        self._compact_size = compact_size
+        self._ttl = ttl
+        os.makedirs(path, exist_ok=True)
+        # advisory locks are held per process, so the threads of a process are serialized per segment
+        self._segment_locks = {}
+        self._lock = threading.Lock()
+
+    @property
+    def path(self):
+        """
+        Directory of the segment files.
+
+        :rtype: str
+        """
+        return self._path
+
+    def get(self, sha1):
+        """
+        Look up the artifact of the given hash value.
+
+        :param sha1: the sha1 hash value.
+        :type sha1: str
+        :return: a dict with ``groupId``, ``artifactId`` and ``version``, or
+            ``None`` if the hash value is not in the cache or expired.
+        :rtype: dict
+        """
+        sha1 = GavCache.normalize_hash(sha1)
+        prefix = sha1[:2]
+        try:
+            with self._segment_lock(prefix), open(self._lock_path(prefix), 'r') as lock_file:
+                PartitionedGavCache._lock_file(lock_file, shared=True)
+                try:
+                    record = self._read_record(prefix, sha1)
+                finally:
+                    PartitionedGavCache._unlock_file(lock_file)
+        except FileNotFoundError:
+            return None
+        if record is None:
+            return None
+        if self._ttl > 0 and float(record[4]) < time.time() - self._ttl:
+            return None
+        return {'groupId': record[1], 'artifactId': record[2], 'version': record[3]}
+
+    def _read_record(self, prefix, sha1):
+        with open(os.path.join(self._path, prefix + PartitionedGavCache.SEGMENT_EXTENSION), 'rb') as segment_file:
+            size = os.fstat(segment_file.fileno()).st_size
+            if size == 0:
+                return None
+            with mmap.mmap(segment_file.fileno(), size, access=mmap.ACCESS_READ) as segment:
+                return PartitionedGavCache._find_last_record(segment, size, sha1)
+
+    def put(self, sha1, *, group_id, artifact_id, version):
+        """
+        Store the artifact of the given hash value.
+
+        :param sha1: the sha1 hash value.
+        :param group_id: the groupId of the artifact.
+        :param artifact_id: the artifactId of the artifact.
+        :param version: the version of the artifact.
+        """
+        self.put_many([(sha1, group_id, artifact_id, version)])
+
+    def put_many(self, artifacts, batch_size=DEFAULT_BATCH_SIZE):
+        """
+        Store artifacts in bulk, appending once per segment and batch.
+
+        :param artifacts: iterable of ``(sha1, groupId, artifactId, version)`` tuples.
+        :param batch_size: number of records buffered before they are appended.
+        :type batch_size: int
+        :return: the number of records stored.
+        :rtype: int
+        """
+        count = 0
+        batch = []
+        for sha1, group_id, artifact_id, version in artifacts:
+            sha1 = GavCache.normalize_hash(sha1)
+            fields = [sha1, group_id, artifact_id, version]
+            if any(PartitionedGavCache.FIELD_SEPARATOR in field or '\n' in field for field in fields):
+                logging.getLogger(__name__).warning('invalid artifact %s of hash %s ignored',
+                                                    ':'.join(fields[1:]), sha1)
+                continue
+            fields.append(repr(time.time()))
+            batch.append(fields)
+            if len(batch) >= batch_size:
+                count += self._append_batch(batch)
+                batch = []
+        if len(batch) > 0:
+            count += self._append_batch(batch)
+        return count
+
+    def _append_batch(self, batch):
+        segments = {}
+        for fields in batch:
+            segments.setdefault(fields[0][:2], []).append(PartitionedGavCache.FIELD_SEPARATOR.join(fields) + '\n')
+        for prefix, lines in segments.items():
+            self._append_segment(prefix, ''.join(lines).encode('utf-8'))
+        logging.getLogger(__name__).debug('stored %d artifacts in %d cache segments', len(batch), len(segments))
+        return len(batch)
+
+    def _append_segment(self, prefix, data):
+        segment_path = os.path.join(self._path, prefix + PartitionedGavCache.SEGMENT_EXTENSION)
+        with self._segment_lock(prefix), open(self._lock_path(prefix), 'a+') as lock_file:
+            PartitionedGavCache._lock_file(lock_file)
+            try:
+                with open(segment_path, 'ab') as segment_file:
+                    segment_file.write(data)
+                    size = segment_file.tell()
+                # the lock file holds the size of the segment after its last compaction
+                lock_file.seek(0)
+                try:
+                    compacted_size = int(lock_file.read() or 0)
+                except ValueError:
+                    compacted_size = 0
+                if size >= max(self._compact_size, 2 * compacted_size):
+                    PartitionedGavCache._compact_segment(segment_path, lock_file)
+            finally:
+                PartitionedGavCache._unlock_file(lock_file)
+
+    def compact(self):
+        """
+        Compact every segment, keeping only the last record of each hash value.
+        """
+        for entry in os.scandir(self._path):
+            if not entry.name.endswith(PartitionedGavCache.SEGMENT_EXTENSION):
+                continue
+            prefix = entry.name[:-len(PartitionedGavCache.SEGMENT_EXTENSION)]
+            with self._segment_lock(prefix), open(self._lock_path(prefix), 'a+') as lock_file:
+                PartitionedGavCache._lock_file(lock_file)
+                try:
+                    PartitionedGavCache._compact_segment(entry.path, lock_file)
+                finally:
+                    PartitionedGavCache._unlock_file(lock_file)
+
+    @staticmethod
+    def _compact_segment(segment_path, lock_file):
+        records = {}
+        with open(segment_path, 'rb') as segment_file:
+            for line in segment_file:
+                # skip records torn by an interrupted writer
+                if not line.endswith(b'\n') or line.count(b'\t') != 4:
+                    continue
+                records[line[:line.index(b'\t')]] = line
+        data = b''.join(records.values())
+        temp_path = segment_path + '.tmp'
+        with open(temp_path, 'wb') as temp_file:
+            temp_file.write(data)
+        os.replace(temp_path, segment_path)
+        lock_file.seek(0)
+        lock_file.truncate()
+        lock_file.write(str(len(data)))
+        lock_file.flush()
+        logging.getLogger(__name__).debug('compacted cache segment %s, %d records', segment_path, len(records))
+
+    def _lock_path(self, prefix):
+        return os.path.join(self._path, prefix + PartitionedGavCache.LOCK_EXTENSION)
+
+    def _segment_lock(self, prefix):
+        with self._lock:
+            return self._segment_locks.setdefault(prefix, threading.Lock())
+
+    @staticmethod
+    def _find_last_record(segment, size, sha1):
+        key = (sha1 + PartitionedGavCache.FIELD_SEPARATOR).encode('utf-8')
+        end = size
+        while True:
+            position = segment.rfind(key, 0, end)
+            if position < 0:
+                return None
+            end = position
+            if position > 0 and segment[position - 1:position] != b'\n':
+                continue
+            line_end = segment.find(b'\n', position)
+            # the last record may still be being appended
+            if line_end < 0:
+                continue
+            fields = segment[position:line_end].decode('utf-8').split(PartitionedGavCache.FIELD_SEPARATOR)
+            if len(fields) == 5:
+                return fields
+
+    @staticmethod
+    def _lock_file(lock_file, shared=False):
+        if fcntl is not None:
+            fcntl.lockf(lock_file, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+
+    @staticmethod
+    def _unlock_file(lock_file):
+        if fcntl is not None:
+            fcntl.lockf(lock_file, fcntl.LOCK_UN)
+
+    def close(self):
+        pass
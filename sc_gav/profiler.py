@@ -0,0 +1,217 @@
+#  The MIT License (MIT)
+#
+#  Copyright (c) 2021. Scott Lau
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#  SOFTWARE.
+
+import cProfile
+import io
+import logging
+import os
+import pstats
+import sys
+import threading
+import tracemalloc
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:
+    # not available on Windows
+    resource = None
+
+
+class StageProfiler(object):
+    """
+    Profile the stages of a run separately.
+
+    In ``cpu`` mode every stage is profiled with cProfile, including the
+    functions wrapped with :py:meth:`wrap` and run by worker threads. Since
+    Python 3.12 a single cProfile profiler sees the calls of all threads and
+    no other one may be enabled at the same time, so worker threads are then
+    profiled by the profiler of the stage. If cProfile is already in use, e.g.
+    by an outer profiler, the stage is run without a cpu profile. The
+    statistics are dumped to ``<stage>.pstats`` with a text summary of the
+    most expensive functions in ``<stage>-cpu.txt``. In ``memory`` mode the
+    allocations of every stage are traced with tracemalloc and the top
+    allocations are written to ``<stage>-memory.txt``.
+
+    The peak RSS of the process is logged at the end of every stage.
+
+    Args:
+        mode (str): ``cpu``, ``memory``, or ``None`` to disable profiling.
+        output_directory (str): directory of the profile files.
+    """
+    CPU = 'cpu'
+    MEMORY = 'memory'
+    MODES = (CPU, MEMORY)
+    TOP_LIMIT = 30
+    PROCESS_WIDE_CPU_PROFILE = sys.version_info >= (3, 12)
+
+    def __init__(self, *, mode=None, output_directory='.'):
+        if mode is not None and mode not in StageProfiler.MODES:
+            raise ValueError('unknown profile mode {0}'.format(mode))
+        self._mode = mode
+        self._output_directory = output_directory
+        self._thread_profiles = None
+        self._generation = 0
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        """
+        Whether profiling is enabled.
+
+        :rtype: bool
+        """
+        return self._mode is not None
+
+    @contextmanager
+    def stage(self, name):
+        """
+        Profile a stage of the run.
+
+        :param name: name of the stage, used in the file names of the profile.
+        :type name: str
+        """
+        if not self.enabled:
+            yield
+            return
+        os.makedirs(self._output_directory, exist_ok=True)
+        if self._mode == StageProfiler.CPU:
+            with self._profile_cpu(name):
+                yield
+        else:
+            with self._profile_memory(name):
+                yield
+        logging.getLogger(__name__).info('stage %s done, peak RSS %s', name,
+                                         StageProfiler.format_size(StageProfiler.peak_rss()))
+
+    def wrap(self, function):
+        """
+        Profile the calls of a function from worker threads in the current stage.
+
+        :return: the wrapped function.
+        """
+        if self._mode != StageProfiler.CPU or StageProfiler.PROCESS_WIDE_CPU_PROFILE:
+            return function
+
+        def profiled(*args, **kwargs):
+            thread_profiles = self._thread_profiles
+            if thread_profiles is None:
+                return function(*args, **kwargs)
+            # one profile per thread and stage
+            if getattr(self._local, 'generation', None) != self._generation:
+                self._local.generation = self._generation
+                self._local.profile = cProfile.Profile()
+                with self._lock:
+                    thread_profiles.append(self._local.profile)
+            profile = self._local.profile
+            try:
+                profile.enable()
+            except ValueError:
+                # another profiler is active, the call is not profiled
+                return function(*args, **kwargs)
+            try:
+                return function(*args, **kwargs)
+            finally:
+                profile.disable()
+
+        return profiled
+
+    @contextmanager
+    def _profile_cpu(self, name):
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError as e:
+            logging.getLogger(__name__).warning('cpu profile of stage %s disabled, cause: %s', name, e)
+            profile = None
+        if profile is None:
+            yield
+            return
+        self._generation += 1
+        self._thread_profiles = []
+        try:
+            yield
+        finally:
+            profile.disable()
+            thread_profiles = self._thread_profiles
+            self._thread_profiles = None
+            summary = io.StringIO()
+            stats = pstats.Stats(profile, stream=summary)
+            for thread_profile in thread_profiles:
+                stats.add(thread_profile)
+            stats_file = os.path.join(self._output_directory, name + '.pstats')
+            stats.dump_stats(stats_file)
+            stats.sort_stats('cumulative').print_stats(StageProfiler.TOP_LIMIT)
+            self._write_summary(name + '-cpu.txt', summary.getvalue())
+            logging.getLogger(__name__).info('cpu profile of stage %s written to %s', name, stats_file)
+
+    @contextmanager
+    def _profile_memory(self, name):
+        started = tracemalloc.is_tracing()
+        if not started:
+            tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+        try:
+            yield
+        finally:
+            after = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+            if not started:
+                tracemalloc.stop()
+            lines = ['stage {0}: traced memory {1}, peak {2}'.format(name, StageProfiler.format_size(current),
+                                                                     StageProfiler.format_size(peak)),
+                     '',
+                     'top {0} allocations by line:'.format(StageProfiler.TOP_LIMIT)]
+            for statistic in after.compare_to(before, 'lineno')[:StageProfiler.TOP_LIMIT]:
+                lines.append(str(statistic))
+            summary_file = self._write_summary(name + '-memory.txt', '\n'.join(lines) + '\n')
+            logging.getLogger(__name__).info('memory profile of stage %s written to %s', name, summary_file)
+
+    def _write_summary(self, filename, summary):
+        path = os.path.join(self._output_directory, filename)
+        with open(path, 'w', encoding='utf-8') as summary_file:
+            summary_file.write(summary)
+        return path
+
+    @staticmethod
+    def peak_rss():
+        """
+        Peak resident set size of the process in bytes, ``None`` if unknown.
+
+        :rtype: int
+        """
+        if resource is None:
+            return None
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # kilobytes on Linux, bytes on macOS
+        return peak if os.uname().sysname == 'Darwin' else peak * 1024
+
+    @staticmethod
+    def format_size(size):
+        if size is None:
+            return '-'
+        for unit in ('B', 'KiB', 'MiB'):
+            if size < 1024:
+                return '{0:.1f} {1}'.format(size, unit)
+            size /= 1024
+        return '{0:.1f} GiB'.format(size)
@@ -0,0 +1,125 @@
+#  The MIT License (MIT)
+#
+#  Copyright (c) 2021. Scott Lau
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#  SOFTWARE.
+
+import json
+import logging
+import os
+import threading
+import time
+
+
+class ProgressReporter(object):
+    """
+    Periodically log a single line summary of a long running search.
+
+    Args:
+        total (int): number of lookups to be processed.
+        interval (float): minimum number of seconds between two summaries.
+        progress_file (str): optional path of a json file updated with every summary.
+    """
+    HIT = 'hit'
+    MISS = 'miss'
+    EXCEPTION = 'exception'
+    MISMATCH = 'mismatch'
+
+    def __init__(self, *, total, interval=10, progress_file=None):
+        self._total = total
+        self._interval = interval
+        self._progress_file = progress_file
+        self._done = 0
+        self._counts = {ProgressReporter.HIT: 0, ProgressReporter.MISS: 0, ProgressReporter.EXCEPTION: 0,
+                        ProgressReporter.MISMATCH: 0}
+        self._start_time = time.monotonic()
+        self._last_report_time = self._start_time
+        self._lock = threading.Lock()
+
+    @property
+    def done(self):
+        """
+        Number of lookups processed so far.
+
+        :rtype: int
+        """
+        return self._done
+
+    def update(self, outcome):
+        """
+        Record a processed lookup, logging a summary if the interval elapsed.
+
+        :param outcome: one of ``hit``, ``miss``, ``exception`` or ``mismatch``.
+        :type outcome: str
+        """
+        with self._lock:
+            self._done += 1
+            self._counts[outcome] += 1
+            now = time.monotonic()
+            if now - self._last_report_time < self._interval:
+                return
+            self._last_report_time = now
+            self._report(now)
+
+    def finish(self):
+        with self._lock:
+            self._report(time.monotonic(), finished=True)
+
+    def _report(self, now, finished=False):
+        elapsed = now - self._start_time
+        rate = self._done / elapsed if elapsed > 0 else 0.0
+        remaining = max(self._total - self._done, 0)
+        eta = remaining / rate if rate > 0 else None
+        logging.getLogger(__name__).info(
+            'progress: %d/%d lookups, %.1f lookups/s, elapsed %s, ETA %s, hit: %d, miss: %d, exception: %d, mismatch: %d',
+            self._done, self._total, rate, ProgressReporter.format_duration(elapsed),
+            ProgressReporter.format_duration(eta), self._counts[ProgressReporter.HIT],
+            self._counts[ProgressReporter.MISS], self._counts[ProgressReporter.EXCEPTION],
+            self._counts[ProgressReporter.MISMATCH])
+        if self._progress_file:
+            self._write_progress_file({
+                'total': self._total,
+                'done': self._done,
+                'rate': rate,
+                'elapsed': elapsed,
+                'eta': eta,
+                'hit': self._counts[ProgressReporter.HIT],
+                'miss': self._counts[ProgressReporter.MISS],
+                'exception': self._counts[ProgressReporter.EXCEPTION],
+                'mismatch': self._counts[ProgressReporter.MISMATCH],
+                'finished': finished,
+            })
+
+    def _write_progress_file(self, progress):
+        temp_file = self._progress_file + '.tmp'
+        try:
+            with open(temp_file, 'w', encoding='utf-8') as output_file:
+                json.dump(progress, output_file)
+            os.replace(temp_file, self._progress_file)
+        except OSError as e:
+            logging.getLogger(__name__).warning('failed to write progress file %s, cause: %s',
+                                                self._progress_file, e)
+
+    @staticmethod
+    def format_duration(seconds):
+        if seconds is None:
+            return '-'
+        minutes, seconds = divmod(int(seconds), 60)
+        hours, minutes = divmod(minutes, 60)
+        return '{0:d}:{1:02d}:{2:02d}'.format(hours, minutes, seconds)
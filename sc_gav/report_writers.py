@@ -0,0 +1,228 @@
+#  The MIT License (MIT)
+#
+#  Copyright (c) 2021. Scott Lau
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#  SOFTWARE.
+
+import abc
+import csv
+import datetime
+import json
+import logging
+import os
+import uuid
+
+from . import __version__
+from .search_constants import SearchConstants
+
+
+class ReportWriter(metaclass=abc.ABCMeta):
+    """
+    Base class of the report writers.
+
+    Rows are written to ``<path>.part`` as soon as each dependency is resolved,
+    so the report can be followed while the search is running. The file is
+    atomically renamed to ``path`` when the writer is closed.
+
+    Args:
+        path (str): path of the report.
+    """
+    DEFAULT_FILENAME = None
+    FOUND = 'Y'
+    NOT_FOUND = 'N'
+    EXCEPTION = 'Exception'
+    MISMATCH = 'Mismatch'
+
+    def __init__(self, *, path):
+        self._path = path
+        self._temp_path = path + '.part'
+        self._file = None
+
+    @property
+    def path(self):
+        """
+        Path of the report.
+
+        :rtype: str
+        """
+        return self._path
+
+    def open(self):
+        logging.getLogger(__name__).info('generating %s...', self._path)
+        self._file = open(self._temp_path, 'w', newline='', encoding='utf-8')
+        try:
+            self._write_header()
+        except BaseException:
+            self.abort()
+            raise
+
+    def write(self, dependency, found):
+        """
+        Write the row of a processed dependency.
+
+        :param dependency: the dependency.
+        :type dependency: dict
+        :param found: one of ``Y``, ``N``, ``Exception`` or ``Mismatch``.
+        :type found: str
+        """
+        self._write_row(dependency, found)
+        self._file.flush()
+
+    def close(self):
+        self._write_footer()
+        self._file.close()
+        os.replace(self._temp_path, self._path)
+        logging.getLogger(__name__).info('%s generated', self._path)
+
+    def abort(self):
+        """
+        Close the writer and discard the partial report.
+        """
+        self._file.close()
+        os.remove(self._temp_path)
+
+    def _write_header(self):
+        pass
+
+    @abc.abstractmethod
+    def _write_row(self, dependency, found):
+        pass
+
+    def _write_footer(self):
+        pass
+
+    @staticmethod
+    def has_artifact(found):
+        return found == ReportWriter.FOUND or found == ReportWriter.MISMATCH
+
+    @staticmethod
+    def format_confidence(dependency):
+        if 'confidence' not in dependency:
+            return ''
+        return '{0:.2f}'.format(dependency['confidence'])
+
+
+class CsvReportWriter(ReportWriter):
+    DEFAULT_FILENAME = 'report.csv'
+
+    def __init__(self, *, path):
+        super(CsvReportWriter, self).__init__(path=path)
+        self._writer = None
+
+    def _write_header(self):
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(['File Name', SearchConstants.DEFAULT_HASH_NAME, 'Found', 'Found With', 'Group Id',
+                               'Artifact Id', 'Version', 'Confidence'])
+
+    def _write_row(self, dependency, found):
+        has_artifact = ReportWriter.has_artifact(found)
+        self._writer.writerow([
+            dependency['filename'],
+            dependency[SearchConstants.DEFAULT_HASH_NAME],
+            found,
+            dependency.get('found_with', '') if found == ReportWriter.FOUND else '',
+            dependency['groupId'] if has_artifact else '',
+            dependency['artifactId'] if has_artifact else '',
+            dependency['version'] if has_artifact else '',
+            ReportWriter.format_confidence(dependency)
+        ])
+
+
+class JsonLinesReportWriter(ReportWriter):
+    DEFAULT_FILENAME = 'report.jsonl'
+
+    def _write_row(self, dependency, found):
+        has_artifact = ReportWriter.has_artifact(found)
+        row = {
+            'filename': dependency['filename'],
+            SearchConstants.DEFAULT_HASH_NAME: dependency[SearchConstants.DEFAULT_HASH_NAME],
+            'found': found,
+            'found_with': dependency.get('found_with', '') if found == ReportWriter.FOUND else '',
+            'groupId': dependency['groupId'] if has_artifact else None,
+            'artifactId': dependency['artifactId'] if has_artifact else None,
+            'version': dependency['version'] if has_artifact else None,
+        }
+        if 'confidence' in dependency:
+            row['confidence'] = dependency['confidence']
+        self._file.write(json.dumps(row))
+        self._file.write('\n')
+
+
+class CycloneDxReportWriter(ReportWriter):
+    """
+    Writes a CycloneDX 1.4 json SBOM, components are streamed into the
+    ``components`` array. Dependencies that were not found are listed by file
+    name and hash value only.
+    """
+    DEFAULT_FILENAME = 'bom.json'
+    SPEC_VERSION = '1.4'
+
+    def __init__(self, *, path):
+        super(CycloneDxReportWriter, self).__init__(path=path)
+        self._hashes = set()
+
+    def _write_header(self):
+        metadata = {
+            'timestamp': datetime.datetime.now(datetime.timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'tools': [{'name': 'sc-search-gav', 'version': __version__}],
+        }
+        self._file.write('{{"bomFormat": "CycloneDX", "specVersion": {0}, "serialNumber": {1}, "version": 1, '
+                         '"metadata": {2}, "components": ['.format(json.dumps(CycloneDxReportWriter.SPEC_VERSION),
+                                                                   json.dumps(uuid.uuid4().urn),
+                                                                   json.dumps(metadata)))
+
+    def _write_row(self, dependency, found):
+        hash_value = dependency[SearchConstants.DEFAULT_HASH_NAME]
+        # a component is listed once, even if several files share its hash value
+        if hash_value in self._hashes:
+            return
+        component = {
+            'type': 'library',
+            'bom-ref': hash_value,
+            'hashes': [{'alg': 'SHA-1', 'content': hash_value}],
+            'properties': [{'name': 'sc-search-gav:filename', 'value': dependency['filename']},
+                           {'name': 'sc-search-gav:found', 'value': found}],
+        }
+        if found == ReportWriter.FOUND:
+            component.update({
+                'group': dependency['groupId'],
+                'name': dependency['artifactId'],
+                'version': dependency['version'],
+                'purl': 'pkg:maven/{0}/{1}@{2}'.format(dependency['groupId'], dependency['artifactId'],
+                                                       dependency['version']),
+            })
+        else:
+            component['name'] = os.path.basename(dependency['filename'])
+        if 'confidence' in dependency:
+            component['properties'].append({'name': 'sc-search-gav:confidence',
+                                            'value': ReportWriter.format_confidence(dependency)})
+        if len(self._hashes) > 0:
+            self._file.write(', ')
+        self._hashes.add(hash_value)
+        self._file.write(json.dumps(component))
+
+    def _write_footer(self):
+        self._file.write(']}\n')
+
+
+REPORT_WRITERS = {
+    'csv': CsvReportWriter,
+    'jsonl': JsonLinesReportWriter,
+    'cyclonedx': CycloneDxReportWriter,
+}
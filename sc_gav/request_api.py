@@ -21,20 +21,25 @@
 #  SOFTWARE.
 import json
 import logging
+import time
 from urllib.parse import urljoin
 
 import requests
 import urllib3
 
 from .exception import *
+from .tracing import TracingContext, TracingHTTPAdapter
 
 
 class RequestClient(object):
     """
     A class to interact with Http
     """
+    # connect and read timeouts in seconds
+    DEFAULT_TIMEOUT = (3.15, 27)
 
-    def __init__(self, *, url, username=None, password=None, x509_verify=True):
+    def __init__(self, *, url, username=None, password=None, x509_verify=True, pool_size=10,
+                 timeout=DEFAULT_TIMEOUT, tracer=None, cassette=None, http_cache=None):
         """
         Create a RequestClient object.
 
@@ -42,11 +47,34 @@ class RequestClient(object):
         :param username: the user name.
         :param password: password.
         :param x509_verify: Whether to validate the x509 certificate when using https
+        :param pool_size: maximum number of kept-alive connections per host,
+            should be at least the number of threads sharing this client.
+        :param timeout: connect and read timeouts in seconds.
+        :param tracer: optional :py:class:`sc_gav.tracing.RequestTracer` or
+            OpenTelemetry tracer receiving one span per request.
+        :param cassette: optional :py:class:`sc_gav.cassette.Cassette` recording
+            or replaying the responses.
+        :param http_cache: optional :py:class:`sc_gav.http_cache.HttpCache`
+            storing and revalidating the GET responses, cannot be combined
+            with a cassette.
         """
+        if cassette is not None and http_cache is not None:
+            raise ValueError('a cassette cannot be combined with an http cache')
         self._url = url
         self._username = username
         self._password = password
         self._x509_verify = x509_verify
+        self._timeout = timeout
+        self._tracer = tracer
+        self._cassette = cassette
+        self._http_cache = http_cache
+        self._session = requests.Session()
+        # also offers br and zstd when urllib3 is able to decode them
+        self._session.headers['Accept-Encoding'] = urllib3.util.make_headers(accept_encoding=True)['accept-encoding']
+        adapter_class = requests.adapters.HTTPAdapter if tracer is None else TracingHTTPAdapter
+        adapter = adapter_class(pool_connections=pool_size, pool_maxsize=pool_size)
+        self._session.mount('http://', adapter)
+        self._session.mount('https://', adapter)
 
     @property
     def url(self):
@@ -84,7 +112,16 @@ class RequestClient(object):
         """
         return self._x509_verify
 
-    def http_request(self, method, endpoint, **kwargs):
+    @property
+    def http_cache(self):
+        """
+        The HTTP cache of the GET responses, ``None`` if disabled.
+
+        :rtype: HttpCache
+        """
+        return self._http_cache
+
+    def http_request(self, method, endpoint, attempt=1, **kwargs):
         """
         Performs a HTTP request to the Nexus REST API on the specified
         endpoint.
@@ -93,15 +130,15 @@ class RequestClient(object):
         :type method: str
         :param endpoint: URI path to be appended to the service URL.
         :type endpoint: str
+        :param attempt: the attempt number of this request, recorded in its span.
+        :type attempt: int
         :param kwargs: as per :py:func:`requests.request`.
         :rtype: requests.Response
         """
         url = urljoin(self._url, endpoint)
 
         try:
-            response = requests.request(
-                method=method, auth=(self._username, self._password), url=url,
-                verify=self._x509_verify, timeout=(3.15, 27), **kwargs)
+            response = self._send(method, url, attempt, **kwargs)
         except requests.exceptions.ConnectionError as e:
             logging.error("failed to connect to %s, cause: %s", url, e)
             raise HttpClientAPIError(e)
@@ -121,6 +158,49 @@ class RequestClient(object):
 
         return response
 
+    def _send(self, method, url, attempt, **kwargs):
+        if self._tracer is None:
+            return self._session_request(method, url, **kwargs)
+        span = self._tracer.start_span('HTTP {0}'.format(method.upper()), attributes={
+            'http.method': method.upper(),
+            'http.url': url,
+            'http.resend_count': attempt - 1,
+        })
+        start_time = time.perf_counter()
+        try:
+            with TracingContext(span):
+                response = self._session_request(method, url, **kwargs)
+            span.set_attribute('http.status_code', response.status_code)
+            # time until the response headers were parsed
+            span.set_attribute('http.first_byte_ms', response.elapsed.total_seconds() * 1000)
+            if response.request.body is not None:
+                span.set_attribute('http.request_content_length', len(response.request.body))
+            if kwargs.get('stream'):
+                content_length = response.headers.get('Content-Length')
+                if content_length is not None:
+                    span.set_attribute('http.response_content_length', int(content_length))
+            else:
+                span.set_attribute('http.response_content_length', len(response.content))
+            return response
+        except Exception as e:
+            span.record_exception(e)
+            raise
+        finally:
+            span.set_attribute('http.total_ms', (time.perf_counter() - start_time) * 1000)
+            span.end()
+
+    def _session_request(self, method, url, **kwargs):
+        kwargs.update(auth=(self._username, self._password), verify=self._x509_verify, timeout=self._timeout)
+        if self._http_cache is not None:
+            return self._http_cache.request(lambda **request_kwargs: self._send_request(method, url, **request_kwargs),
+                                            method, url, **kwargs)
+        return self._send_request(method, url, **kwargs)
+
+    def _send_request(self, method, url, **kwargs):
+        if self._cassette is not None:
+            return self._cassette.request(self._session, method, url, **kwargs)
+        return self._session.request(method=method, url=url, **kwargs)
+
     def http_get(self, endpoint):
         """
         Performs a HTTP GET request on the given endpoint.
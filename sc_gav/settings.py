@@ -0,0 +1,191 @@
+#  The MIT License (MIT)
+#
+#  Copyright (c) 2021. Scott Lau
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#  SOFTWARE.
+
+from scutils import Singleton
+
+from .exception import InvalidConfigurationException
+from .report_writers import REPORT_WRITERS
+from .utils import config
+
+
+class Settings(metaclass=Singleton):
+    """
+    Typed settings of the search backend, throughput and cache, loaded and
+    validated once from the configuration.
+
+    Raises:
+        InvalidConfigurationException: if a value has the wrong type or is out of range.
+
+    Attributes:
+        search_url (str): url of the search backend.
+        retries (int): number of retries of a failed request.
+        internal_prefixes (list): file name prefixes of internal jars, which are not expected online.
+        internal_policy (str): ``defer`` to search internal jars last, ``skip`` to never search them online.
+        workers (int): number of concurrent searches.
+        verify_workers (int): number of concurrent verification requests.
+        scan_workers (int): number of archives scanned concurrently.
+        batch_size (int): number of artifacts stored in the cache per transaction.
+        connect_timeout (float): connect timeout of backend requests in seconds.
+        read_timeout (float): read timeout of backend requests in seconds.
+        pool_size (int): maximum number of kept-alive connections.
+        rate_limit (float): maximum number of requests per second, ``0`` for no limit.
+        cache_enabled (bool): whether the local cache is used.
+        cache_layout (str): ``sqlite`` or ``partitioned``.
+        cache_path (str): path of the sqlite cache database.
+        cache_segments_path (str): directory of the partitioned cache segments.
+        cache_compact_size (int): minimum size in bytes of a segment before it is compacted.
+        cache_ttl (float): seconds after which a cached artifact expires, ``0`` for never.
+        cassette_mode (str): ``record``, ``replay``, or an empty string to send requests normally.
+        cassette_path (str): path of the cassette file.
+        cassette_latency_scale (float): multiple of the recorded response time waited when replaying.
+        http_cache_enabled (bool): whether the GET responses are kept in the HTTP cache.
+        http_cache_path (str): path of the HTTP cache file.
+        verify_enabled (bool): whether the pre-filled artifacts are verified online.
+        fingerprint_enabled (bool): whether jars not found online are matched by fingerprint.
+        fingerprint_index_path (str): path of the fingerprint index.
+        fingerprint_threshold (float): minimum estimated share of identical classes of a match.
+        progress_interval (float): minimum number of seconds between two progress summaries.
+        progress_file (str): json file updated with every progress summary, ``None`` for none.
+        tracing_file (str): json lines file receiving the request spans, ``None`` for no tracing.
+        output_formats (list): formats of the reports written while searching.
+        scan_nested_archives (bool): whether the jars nested in fat jars, WARs and EARs are hashed.
+    """
+    INTERNAL_POLICIES = ('defer', 'skip')
+    CACHE_LAYOUTS = ('sqlite', 'partitioned')
+    CASSETTE_MODES = ('', 'record', 'replay')
+
+    def __init__(self):
+        self.search_url = Settings._get_str('search.url', 'https://search.maven.org')
+        self.retries = Settings._get_int('search.retries', 3, minimum=0)
+        self.internal_prefixes = Settings._get_str_list('search.internal_prefixes', [])
+        self.internal_policy = Settings._get_str('search.internal_policy', 'defer')
+        if self.internal_policy not in Settings.INTERNAL_POLICIES:
+            raise InvalidConfigurationException('search.internal_policy must be one of {0}, got {1!r}'.format(
+                ', '.join(Settings.INTERNAL_POLICIES), self.internal_policy))
+        self.workers = Settings._get_int('performance.workers', 4, minimum=1)
+        self.verify_workers = Settings._get_int('performance.verify_workers', 8, minimum=1)
+        self.scan_workers = Settings._get_int('performance.scan_workers', 4, minimum=1)
+        self.batch_size = Settings._get_int('performance.batch_size', 1000, minimum=1)
+        self.connect_timeout = Settings._get_float('performance.connect_timeout', 3.15, minimum=0.001)
+        self.read_timeout = Settings._get_float('performance.read_timeout', 27, minimum=0.001)
+        pool_size = Settings._get_int('performance.pool_size', 0, minimum=0)
+        # every worker thread needs its own kept-alive connection
+        self.pool_size = pool_size or max(self.workers, self.verify_workers)
+        self.rate_limit = Settings._get_float('performance.rate_limit', 0, minimum=0)
+        self.cache_enabled = Settings._get_bool('cache.enabled', True)
+        self.cache_layout = Settings._get_str('cache.layout', 'sqlite')
+        if self.cache_layout not in Settings.CACHE_LAYOUTS:
+            raise InvalidConfigurationException('cache.layout must be one of {0}, got {1!r}'.format(
+                ', '.join(Settings.CACHE_LAYOUTS), self.cache_layout))
+        self.cache_path = Settings._get_str('cache.path', '/var/opt/sc/.sc-search-gav/gav-cache.db')
+        self.cache_segments_path = Settings._get_str('cache.segments_path', '/var/opt/sc/.sc-search-gav/gav-cache')
+        self.cache_compact_size = Settings._get_int('cache.compact_size', 1048576, minimum=1)
+        self.cache_ttl = Settings._get_float('cache.ttl', 0, minimum=0)
+        self.cassette_mode = Settings._get('cassette.mode', '')
+        if self.cassette_mode not in Settings.CASSETTE_MODES:
+            raise InvalidConfigurationException('cassette.mode must be record, replay or empty, got {0!r}'.format(
+                self.cassette_mode))
+        self.cassette_path = Settings._get_str('cassette.path', '/var/opt/sc/.sc-search-gav/cassette.db')
+        self.cassette_latency_scale = Settings._get_float('cassette.latency_scale', 0, minimum=0)
+        self.http_cache_enabled = Settings._get_bool('http_cache.enabled', False)
+        self.http_cache_path = Settings._get_str('http_cache.path', '/var/opt/sc/.sc-search-gav/http-cache.db')
+        self.verify_enabled = Settings._get_bool('verify.enabled', False)
+        self.fingerprint_enabled = Settings._get_bool('fingerprint.enabled', False)
+        self.fingerprint_index_path = Settings._get_str('fingerprint.index_path',
+                                                        '/var/opt/sc/.sc-search-gav/fingerprint-index.db')
+        self.fingerprint_threshold = Settings._get_float('fingerprint.threshold', 0.8, minimum=0)
+        if self.fingerprint_threshold > 1:
+            raise InvalidConfigurationException('fingerprint.threshold must be at most 1, got {0}'.format(
+                self.fingerprint_threshold))
+        self.progress_interval = Settings._get_float('progress.interval', 10, minimum=0)
+        self.progress_file = Settings._get_optional_str('progress.file')
+        self.tracing_file = Settings._get_optional_str('tracing.file')
+        self.output_formats = Settings._get_str_list('output.formats', ['csv'])
+        unknown_formats = [output_format for output_format in self.output_formats
+                           if output_format not in REPORT_WRITERS]
+        if len(self.output_formats) == 0 or len(unknown_formats) > 0:
+            raise InvalidConfigurationException('output.formats must be a non-empty list of {0}, got {1!r}'.format(
+                ', '.join(REPORT_WRITERS.keys()), self.output_formats))
+        self.scan_nested_archives = Settings._get_bool('scan_nested_archives', False)
+
+    @staticmethod
+    def _get(key, default):
+        value = config.get(key)
+        return default if value is None else value
+
+    @staticmethod
+    def _get_str(key, default):
+        value = Settings._get(key, default)
+        if not isinstance(value, str) or not value:
+            raise InvalidConfigurationException('{0} must be a non-empty string, got {1!r}'.format(key, value))
+        return value
+
+    @staticmethod
+    def _get_optional_str(key):
+        value = Settings._get(key, '')
+        if not isinstance(value, str):
+            raise InvalidConfigurationException('{0} must be a string, got {1!r}'.format(key, value))
+        return value or None
+
+    @staticmethod
+    def _get_str_list(key, default):
+        value = Settings._get(key, default)
+        if not isinstance(value, list) or not all(isinstance(item, str) and item for item in value):
+            raise InvalidConfigurationException('{0} must be a list of non-empty strings, got {1!r}'.format(
+                key, value))
+        return value
+
+    @staticmethod
+    def _get_bool(key, default):
+        value = Settings._get(key, default)
+        # values set by environment variables are strings
+        if isinstance(value, str) and value.lower() in ('true', 'false'):
+            return value.lower() == 'true'
+        if not isinstance(value, bool):
+            raise InvalidConfigurationException('{0} must be True or False, got {1!r}'.format(key, value))
+        return value
+
+    @staticmethod
+    def _get_int(key, default, minimum):
+        value = Settings._get(key, default)
+        try:
+            if isinstance(value, bool) or isinstance(value, float):
+                raise ValueError
+            number = int(value)
+        except (TypeError, ValueError):
+            raise InvalidConfigurationException('{0} must be an integer, got {1!r}'.format(key, value))
+        if number < minimum:
+            raise InvalidConfigurationException('{0} must be at least {1}, got {2}'.format(key, minimum, number))
+        return number
+
+    @staticmethod
+    def _get_float(key, default, minimum):
+        value = Settings._get(key, default)
+        try:
+            if isinstance(value, bool):
+                raise ValueError
+            number = float(value)
+        except (TypeError, ValueError):
+            raise InvalidConfigurationException('{0} must be a number, got {1!r}'.format(key, value))
+        if number < minimum:
+            raise InvalidConfigurationException('{0} must be at least {1}, got {2}'.format(key, minimum, number))
+        return number
@@ -0,0 +1,88 @@
+#  The MIT License (MIT)
+#
+#  Copyright (c) 2021. Scott Lau
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#  SOFTWARE.
+
+import http.server
+import json
+import threading
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from sc_gav.gav_cache import GavCache
+from sc_gav.gav_searcher import GavSearcher
+from sc_gav.rate_limiter import RateLimiter
+
+
+class BackendHandler(http.server.BaseHTTPRequestHandler):
+    """
+    Answers every GET request with a small json document, cacheable for the
+    ``max_age`` query parameter seconds and revalidated with an ``ETag``.
+    """
+    ETAG = '"v1"'
+
+    def do_GET(self):
+        self.server.requests.append((self.path, self.headers.get('If-None-Match')))
+        query = parse_qs(urlsplit(self.path).query)
+        max_age = query.get('max_age', ['0'])[0]
+        if self.headers.get('If-None-Match') == BackendHandler.ETAG:
+            self.send_response(304)
+            self.send_header('ETag', BackendHandler.ETAG)
+            self.send_header('Cache-Control', 'max-age=' + max_age)
+            self.end_headers()
+            return
+        body = json.dumps({'path': urlsplit(self.path).path, 'items': [1, 2, 3]}).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Cache-Control', 'max-age=' + max_age)
+        self.send_header('ETag', BackendHandler.ETAG)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def backend():
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), BackendHandler)
+    server.requests = []
+    server.url = 'http://127.0.0.1:{0}/'.format(server.server_address[1])
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def searcher(tmp_path):
+    # bypass the singleton and the configuration
+    searcher = object.__new__(GavSearcher)
+    searcher._cache = GavCache(path=str(tmp_path / 'cache' / 'gav-cache.db'))
+    searcher._rate_limiter = RateLimiter(rate=0)
+    searcher._retries = 0
+    searcher._workers = 1
+    searcher._internal_prefixes = ()
+    searcher._skip_internal = False
+    yield searcher
+    searcher._cache.close()
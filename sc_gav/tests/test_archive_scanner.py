@@ -0,0 +1,71 @@
+#  The MIT License (MIT)
+#
+#  Copyright (c) 2021. Scott Lau
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#  SOFTWARE.
+
+import csv
+import hashlib
+
+from sc_gav.archive_scanner import ArchiveScanner
+from sc_gav.tests.archives import make_jar
+
+LIBRARY = make_jar({'org/example/Library.class': 'library'})
+
+
+def sha1(data):
+    return hashlib.sha1(data).hexdigest()
+
+
+def test_scan_of_a_fat_jar(tmp_path):
+    fat_jar = make_jar({'org/example/Application.class': 'application'},
+                       {'BOOT-INF/lib/library-1.0.jar': LIBRARY, 'BOOT-INF/classes/application.properties': ''})
+    path = tmp_path / 'application.jar'
+    path.write_bytes(fat_jar)
+    results = ArchiveScanner.scan_archive(str(path))
+    assert results == [{'filename': str(path), 'sha1': sha1(fat_jar)},
+                       {'filename': str(path) + '!/BOOT-INF/lib/library-1.0.jar', 'sha1': sha1(LIBRARY)}]
+    with ArchiveScanner.open_archive(results[1]['filename']) as nested_file:
+        assert nested_file.read() == LIBRARY
+
+
+def test_scan_of_an_ear(tmp_path):
+    war = make_jar({}, {'WEB-INF/lib/library-1.0.jar': LIBRARY})
+    ear = make_jar({}, {'web.war': war, 'lib/library-1.0.jar': LIBRARY, 'META-INF/other.jar': LIBRARY})
+    path = tmp_path / 'application.ear'
+    path.write_bytes(ear)
+    filenames = [result['filename'] for result in ArchiveScanner.scan_archive(str(path))]
+    assert filenames == [str(path), str(path) + '!/web.war', str(path) + '!/web.war!/WEB-INF/lib/library-1.0.jar',
+                         str(path) + '!/lib/library-1.0.jar']
+
+
+def test_invalid_archives_are_skipped(tmp_path):
+    path = tmp_path / 'invalid.jar'
+    path.write_bytes(b'not a zip file')
+    assert ArchiveScanner.scan_archive(str(path)) == []
+
+
+def test_generate_hash(tmp_path):
+    (tmp_path / 'library-1.0.jar').write_bytes(LIBRARY)
+    (tmp_path / 'readme.txt').write_text('not an archive')
+    report_file = str(tmp_path / 'lib-hash.csv')
+    ArchiveScanner.generate_hash([str(tmp_path)], workers=2, report_file=report_file)
+    with open(report_file, newline='', encoding='utf-8') as csv_file:
+        rows = list(csv.reader(csv_file))
+    assert rows == [['File Name', 'sha1'], [str(tmp_path / 'library-1.0.jar'), sha1(LIBRARY)]]
@@ -0,0 +1,43 @@
+#  The MIT License (MIT)
+#
+#  Copyright (c) 2021. Scott Lau
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#  SOFTWARE.
+
+from sc_gav.artifact_registry import ArtifactRegistry, StringTable
+
+
+def test_string_table_interns_strings():
+    table = StringTable()
+    assert table.intern('org.example') == table.intern('org.example') == 0
+    assert table.intern('com.example') == 1
+    assert table.get(1) == 'com.example'
+    assert len(table) == 2
+
+
+def test_artifacts_are_deduplicated_on_their_coordinates():
+    registry = ArtifactRegistry()
+    assert registry.add('g', 'a', '1.0') == (0, True)
+    assert registry.add('g', 'a', '1.0') == (0, False)
+    # the same strings in another position are a distinct artifact
+    assert registry.add('a', 'g', '1.0') == (1, True)
+    assert registry.add('g', 'a', '2.0') == (2, True)
+    assert len(registry) == 3
+    assert registry.get(1) == {'groupId': 'a', 'artifactId': 'g', 'version': '1.0'}
+    assert [artifact['version'] for artifact in registry] == ['1.0', '1.0', '2.0']
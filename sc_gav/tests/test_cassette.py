@@ -0,0 +1,54 @@
+#  The MIT License (MIT)
+#
+#  Copyright (c) 2021. Scott Lau
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#  SOFTWARE.
+
+import os
+
+import pytest
+
+from sc_gav.cassette import Cassette, CassetteMissException
+from sc_gav.request_api import RequestClient
+
+
+def test_request_key_sorts_the_query_parameters():
+    assert Cassette.request_key('get', 'http://Example.org/search?b=2', {'a': '1'}) == \
+        Cassette.request_key('GET', 'http://example.org/search', {'b': '2', 'a': '1'}) == \
+        'GET http://example.org/search?a=1&b=2'
+
+
+def test_record_and_replay(backend, tmp_path):
+    path = str(tmp_path / 'cassette.db')
+    recorder = RequestClient(url=backend.url, cassette=Cassette(path=path, mode=Cassette.RECORD))
+    recorded = recorder.http_request('get', 'search', params={'q': 'x'})
+    player = RequestClient(url=backend.url, cassette=Cassette(path=path, mode=Cassette.REPLAY))
+    replayed = player.http_get('search?q=x')
+    assert len(backend.requests) == 1
+    assert replayed.status_code == 200
+    assert b''.join(replayed.iter_content(1024)) == recorded.content
+    with pytest.raises(CassetteMissException):
+        player.http_request('get', 'other')
+
+
+def test_replay_of_a_missing_cassette(tmp_path):
+    path = str(tmp_path / 'cassette.db')
+    with pytest.raises(FileNotFoundError):
+        Cassette(path=path, mode=Cassette.REPLAY)
+    assert not os.path.exists(path)
@@ -0,0 +1,57 @@
+#  The MIT License (MIT)
+#
+#  Copyright (c) 2021. Scott Lau
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#  SOFTWARE.
+
+from sc_gav.gav_cache import GavCache
+
+SHA1 = 'a' * 40
+
+
+def test_put_and_get(tmp_path):
+    cache = GavCache(path=str(tmp_path / 'cache' / 'gav-cache.db'))
+    try:
+        cache.put(' ' + SHA1.upper(), group_id='g', artifact_id='a', version='1.0')
+        assert cache.get(SHA1) == {'groupId': 'g', 'artifactId': 'a', 'version': '1.0'}
+        assert cache.get('b' * 40) is None
+    finally:
+        cache.close()
+
+
+def test_put_many_in_batches(tmp_path):
+    cache = GavCache(path=str(tmp_path / 'gav-cache.db'))
+    try:
+        artifacts = [('{0:040x}'.format(number), 'g', 'a', str(number)) for number in range(25)]
+        assert cache.put_many(artifacts, batch_size=10) == 25
+        assert cache.get('{0:040x}'.format(24))['version'] == '24'
+    finally:
+        cache.close()
+
+
+def test_expired_artifacts(tmp_path):
+    path = str(tmp_path / 'gav-cache.db')
+    cache = GavCache(path=path)
+    cache.put(SHA1, group_id='g', artifact_id='a', version='1.0')
+    cache.close()
+    cache = GavCache(path=path, ttl=1e-9)
+    try:
+        assert cache.get(SHA1) is None
+    finally:
+        cache.close()
@@ -0,0 +1,74 @@
+#  The MIT License (MIT)
+#
+#  Copyright (c) 2021. Scott Lau
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#  SOFTWARE.
+
+import json
+
+from sc_gav.gav_cache import GavCache
+from sc_gav.gav_cache_importer import GavCacheImporter
+
+ONLINE_SHA1 = '1' * 40
+FINGERPRINT_SHA1 = '2' * 40
+NOT_FOUND_SHA1 = '3' * 40
+
+
+def test_report_csv_skips_fingerprint_matches(tmp_path):
+    report = tmp_path / 'report.csv'
+    report.write_text('File Name,sha1,Found,Found With,Group Id,Artifact Id,Version\n'
+                      'a.jar,{0},Y,online,g,a,1.0\n'
+                      'b.jar,{1},Y,fingerprint,g,b,1.0\n'
+                      'c.jar,{2},N,,,,\n'.format(ONLINE_SHA1, FINGERPRINT_SHA1, NOT_FOUND_SHA1), encoding='utf-8')
+    assert list(GavCacheImporter.parse_report_csv(str(report))) == [(ONLINE_SHA1, 'g', 'a', '1.0')]
+
+
+def test_jsonl_report_skips_fingerprint_matches(tmp_path):
+    report = tmp_path / 'report.jsonl'
+    report.write_text('\n'.join(json.dumps(row) for row in [
+        {'sha1': ONLINE_SHA1, 'found': 'Y', 'found_with': 'online', 'groupId': 'g', 'artifactId': 'a',
+         'version': '1.0'},
+        {'sha1': FINGERPRINT_SHA1, 'found': 'Y', 'found_with': 'fingerprint', 'groupId': 'g', 'artifactId': 'b',
+         'version': '1.0'},
+        {'sha1': NOT_FOUND_SHA1, 'found': 'Mismatch', 'found_with': '', 'groupId': 'g', 'artifactId': 'c',
+         'version': '1.0'},
+    ]) + '\n', encoding='utf-8')
+    assert list(GavCacheImporter.parse_jsonl(str(report))) == [(ONLINE_SHA1, 'g', 'a', '1.0')]
+
+
+def test_jsonl_skips_lines_not_objects(tmp_path):
+    artifacts = tmp_path / 'artifacts.jsonl'
+    artifacts.write_text('[1, 2]\n"text"\nnull\n{0}\n'.format(
+        json.dumps({'sha1': ONLINE_SHA1, 'groupId': 'g', 'artifactId': 'a', 'version': '1.0'})), encoding='utf-8')
+    assert list(GavCacheImporter.parse_jsonl(str(artifacts))) == [(ONLINE_SHA1, 'g', 'a', '1.0')]
+
+
+def test_import_files(tmp_path):
+    (tmp_path / 'artifacts.jsonl').write_text(
+        json.dumps({'sha1': ONLINE_SHA1, 'groupId': 'g', 'artifactId': 'a', 'version': '1.0'}) + '\n'
+        'not json\n', encoding='utf-8')
+    (tmp_path / 'dump.txt').write_text('# sha1 dump\n{0}  g:b:jar:2.0\ninvalid\n'.format(FINGERPRINT_SHA1),
+                                       encoding='utf-8')
+    cache = GavCache(path=str(tmp_path / 'gav-cache.db'))
+    try:
+        assert GavCacheImporter.import_files(cache, [str(tmp_path)]) == 2
+        assert cache.get(ONLINE_SHA1) == {'groupId': 'g', 'artifactId': 'a', 'version': '1.0'}
+        assert cache.get(FINGERPRINT_SHA1) == {'groupId': 'g', 'artifactId': 'b', 'version': '2.0'}
+    finally:
+        cache.close()
@@ -0,0 +1,63 @@
+#  The MIT License (MIT)
+#
+#  Copyright (c) 2021. Scott Lau
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#  SOFTWARE.
+
+from sc_gav.gav_list_parser import GavListParser
+
+POM = '''<?xml version="1.0" encoding="UTF-8"?>
+<project xmlns="http://maven.apache.org/POM/4.0.0">
+  <dependencies>
+    <dependency>
+      <groupId>org.example</groupId>
+      <artifactId>library</artifactId>
+      <version>1.0</version>
+    </dependency>
+    <dependency>
+      <groupId>org.example</groupId>
+      <artifactId>web</artifactId>
+      <version>2.0</version>
+      <type>war</type>
+      <classifier>tests</classifier>
+    </dependency>
+    <dependency>
+      <groupId>org.example</groupId>
+      <artifactId>managed</artifactId>
+      <version>${managed.version}</version>
+    </dependency>
+  </dependencies>
+</project>
+'''
+
+
+def test_parse_files(tmp_path):
+    (tmp_path / 'module').mkdir()
+    (tmp_path / 'module' / 'pom.xml').write_text(POM, encoding='utf-8')
+    gav_list = tmp_path / 'artifacts.txt'
+    gav_list.write_text('# artifacts\norg.example:library:1.0\norg.example:tool:jar:linux:3.0\ninvalid\n',
+                        encoding='utf-8')
+    artifacts = GavListParser.parse_files([str(tmp_path / 'module'), str(gav_list)])
+    assert artifacts == [
+        {'groupId': 'org.example', 'artifactId': 'library', 'version': '1.0', 'packaging': 'jar', 'classifier': ''},
+        {'groupId': 'org.example', 'artifactId': 'web', 'version': '2.0', 'packaging': 'war',
+         'classifier': 'tests'},
+        {'groupId': 'org.example', 'artifactId': 'tool', 'version': '3.0', 'packaging': 'jar',
+         'classifier': 'linux'},
+    ]
@@ -0,0 +1,305 @@
+#  The MIT License (MIT)
+#
+#  Copyright (c) 2021. Scott Lau
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#  SOFTWARE.
+
+import csv
+import json
+import os
+import threading
+
+import pytest
+import requests
+
+from sc_gav.artifact_registry import ArtifactRegistry
+from sc_gav.gav_searcher import GavSearcher
+from sc_gav.partitioned_gav_cache import PartitionedGavCache
+from sc_gav.profiler import StageProfiler
+from sc_gav.progress import ProgressReporter
+
+SHA1 = 'a' * 40
+OTHER_SHA1 = 'b' * 40
+
+
+def make_response(status_code, body):
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = body.encode('utf-8')
+    response.encoding = 'utf-8'
+    return response
+
+
+def search_response(*artifacts, timestamps=None):
+    docs = [{'g': group_id, 'a': artifact_id, 'v': version, 'timestamp': timestamp}
+            for (group_id, artifact_id, version), timestamp in zip(artifacts, timestamps or [1] * len(artifacts))]
+    return make_response(200, json.dumps({'response': {'numFound': len(docs), 'docs': docs}}))
+
+
+class FakeSearchClient(object):
+    def __init__(self, *, sha1_search, checksum=None):
+        self._sha1_search = sha1_search
+        self._checksum = checksum
+        self.checksum_requests = 0
+
+    def search_with_sha1(self, sha1, attempt=1):
+        return self._sha1_search
+
+    def get_artifact_sha1(self, *, group_id, artifact_id, version, packaging='jar', classifier='', attempt=1):
+        self.checksum_requests += 1
+        return self._checksum
+
+
+def dependency(sha1=SHA1):
+    return {'sha1': sha1, 'filename': 'lib/a-1.0.jar', 'groupId': 'g', 'artifactId': 'a', 'version': '1.0',
+            'found': 'Y'}
+
+
+def test_verification_ignores_the_cache(searcher):
+    searcher._cache.put(SHA1, group_id='g', artifact_id='a', version='1.0')
+    searcher._online_client = FakeSearchClient(sha1_search=search_response(('g', 'other', '1.0')))
+    assert searcher._verify_dependency(dependency()) is False
+
+
+def test_verified_by_the_online_search(searcher):
+    searcher._online_client = FakeSearchClient(sha1_search=search_response(('g', 'a', '1.0')))
+    assert searcher._verify_dependency(dependency()) is True
+    assert searcher._cache.get(SHA1) == {'groupId': 'g', 'artifactId': 'a', 'version': '1.0'}
+
+
+def test_verified_by_a_newer_artifact_with_the_same_hash(searcher):
+    response = search_response(('g', 'a', '1.0'), ('g', 'relocated', '1.0'), timestamps=[2, 1])
+    searcher._online_client = FakeSearchClient(sha1_search=response)
+    assert searcher._verify_dependency(dependency()) is True
+
+
+def test_verified_by_the_checksum_file(searcher):
+    client = FakeSearchClient(sha1_search=search_response(), checksum=make_response(200, SHA1.upper() + '  a.jar'))
+    searcher._online_client = client
+    assert searcher._verify_dependency(dependency()) is True
+    assert client.checksum_requests == 1
+
+
+def test_mismatch_of_the_checksum_file(searcher):
+    searcher._online_client = FakeSearchClient(sha1_search=search_response(),
+                                               checksum=make_response(200, OTHER_SHA1))
+    assert searcher._verify_dependency(dependency()) is False
+    assert searcher._cache.get(SHA1) is None
+
+
+def test_mismatch_of_a_missing_artifact(searcher):
+    searcher._online_client = FakeSearchClient(sha1_search=search_response(), checksum=make_response(404, ''))
+    assert searcher._verify_dependency(dependency()) is False
+
+
+def test_unverified_on_server_error(searcher):
+    searcher._online_client = FakeSearchClient(sha1_search=search_response(), checksum=make_response(503, ''))
+    assert searcher._verify_dependency(dependency()) is None
+
+
+def test_unverified_pre_filled_rows_are_not_cached(searcher, tmp_path):
+    searcher._output_formats = ['csv']
+    unverified = dict(dependency(), verified=None)
+    mismatch = dict(dependency(OTHER_SHA1), verified=False)
+    searcher._write_project(str(tmp_path), [unverified, mismatch], {}, iter(()))
+    assert searcher._cache.get(SHA1) is None
+    assert searcher._cache.get(OTHER_SHA1) is None
+    assert (tmp_path / 'report.csv').is_file()
+    assert (tmp_path / 'pom.xml').is_file()
+
+
+def test_cache_errors_are_cache_misses(searcher, tmp_path):
+    searcher._cache = PartitionedGavCache(path=str(tmp_path / 'segments'))
+    # the lock file of the segment of the hash value cannot be opened
+    os.mkdir(tmp_path / 'segments' / (SHA1[:2] + PartitionedGavCache.LOCK_EXTENSION))
+    assert searcher._search_cache(SHA1, 'lib/a-1.0.jar') is None
+    searcher._store_in_cache(dependency())
+    assert searcher._search_cache(SHA1, 'lib/a-1.0.jar') is None
+
+
+@pytest.mark.parametrize('filename, versioned', [
+    ('lib/commons-lang3-3.12.0.jar', True),
+    ('app.war!/WEB-INF/lib/spring-core-5.3.9.RELEASE.jar', True),
+    ('lib\\guava-31.0-jre.jar', True),
+    ('lib/commons-lang3.jar', False),
+    ('lib/3.12.0.jar', False),
+    ('lib/commons-lang3-3.12.0.zip', False),
+])
+def test_is_versioned_filename(filename, versioned):
+    assert GavSearcher.is_versioned_filename(filename) is versioned
+
+
+def search_hashes(searcher, pending):
+    return searcher._search_hashes(pending, ProgressReporter(total=len(pending)), StageProfiler())
+
+
+@pytest.mark.parametrize('skip_internal, expected_searches', [
+    (False, [('3', True), ('4', True), ('2', True)]),
+    (True, [('2', False), ('3', True), ('4', True)]),
+])
+def test_search_order(searcher, skip_internal, expected_searches):
+    searcher._cache.put('1' * 40, group_id='g', artifact_id='cached', version='1.0')
+    searcher._internal_prefixes = ('acme-',)
+    searcher._skip_internal = skip_internal
+    searches = []
+
+    def search_dependency(hash_value, filename, online=True):
+        searches.append((hash_value[0], online))
+        return {}
+
+    searcher._search_dependency = search_dependency
+    pending = {'2' * 40: 'lib/acme-core-1.0.jar', '4' * 40: 'lib/unversioned.jar', '3' * 40: 'lib/a-1.0.jar',
+               '1' * 40: 'lib/cached.jar'}
+    lookups = list(search_hashes(searcher, pending))
+    assert lookups[0][0] == '1' * 40
+    assert lookups[0][1]['found_with'] == 'cache'
+    assert searches == expected_searches
+
+
+def test_searches_are_returned_as_they_complete(searcher):
+    searcher._workers = 2
+    release = threading.Event()
+
+    def search_dependency(hash_value, filename, online=True):
+        if hash_value == SHA1:
+            # the first search waits until the second one was returned
+            assert release.wait(5)
+        return {}
+
+    searcher._search_dependency = search_dependency
+    lookups = search_hashes(searcher, {SHA1: 'lib/a-1.0.jar', OTHER_SHA1: 'lib/b-1.0.jar'})
+    assert next(lookups) == (OTHER_SHA1, {})
+    release.set()
+    assert list(lookups) == [(SHA1, {})]
+
+
+def test_rows_are_written_as_their_search_completes(searcher, tmp_path):
+    searcher._output_formats = ['jsonl']
+    dependencies = [dict(dependency(SHA1), found='N', filename='lib/a-1.0.jar'),
+                    dict(dependency(OTHER_SHA1), found='N', filename='lib/b-1.0.jar')]
+    lookups = iter([
+        (OTHER_SHA1, {'sha1': OTHER_SHA1, 'groupId': 'g', 'artifactId': 'b', 'version': '1.0', 'found': True}),
+        (SHA1, {'sha1': SHA1, 'groupId': 'g', 'artifactId': 'a', 'version': '1.0', 'found': True}),
+    ])
+    searcher._write_project(str(tmp_path), dependencies, {}, lookups)
+    with open(tmp_path / 'report.jsonl', encoding='utf-8') as report_file:
+        assert [json.loads(line)['filename'] for line in report_file] == ['lib/b-1.0.jar', 'lib/a-1.0.jar']
+    # the build files keep the order of the dependencies
+    pom = (tmp_path / 'pom.xml').read_text(encoding='utf-8')
+    assert pom.index('<artifactId>a</artifactId>') < pom.index('<artifactId>b</artifactId>')
+
+
+@pytest.mark.parametrize('result', [
+    {'sha1': SHA1, 'groupId': 'g', 'artifactId': 'a', 'version': '1.0', 'found': True, 'found_with': 'online'},
+    {'sha1': SHA1, 'groupId': 'g', 'artifactId': 'a', 'version': '1.0', 'found': True, 'found_with': 'fingerprint',
+     'confidence': 0.9},
+    {'sha1': SHA1, 'found': False, 'exception': True},
+    {},
+])
+def test_compact_results(result):
+    searched_artifacts = ArtifactRegistry()
+    compact_result = GavSearcher._compact_result(dict(result, filename='lib/a-1.0.jar'), searched_artifacts)
+    assert GavSearcher._expand_result(SHA1, compact_result, searched_artifacts) == result
+    assert len(searched_artifacts) == (1 if result.get('found') else 0)
+
+
+class BatchSearchClient(object):
+    http_cache = None
+
+    def __init__(self, artifacts):
+        self._artifacts = artifacts
+        self.searches = []
+
+    def search_with_sha1(self, sha1, attempt=1):
+        self.searches.append(sha1)
+        return search_response(*self._artifacts.get(sha1, []))
+
+
+def write_hash_file(directory, rows, header=('File Name', 'sha1')):
+    directory.mkdir()
+    with open(directory / 'lib-hash.csv', 'w', newline='', encoding='utf-8') as hash_file:
+        writer = csv.writer(hash_file)
+        writer.writerow(header)
+        writer.writerows(rows)
+    return str(directory / 'lib-hash.csv')
+
+
+def read_report(directory):
+    with open(directory / 'report.csv', newline='', encoding='utf-8') as report_file:
+        return [row[:3] for row in csv.reader(report_file)][1:]
+
+
+def test_batch_search_of_projects_sharing_hash_values(searcher, tmp_path):
+    searcher._online_client = BatchSearchClient({SHA1: [('g', 'a', '1.0')]})
+    searcher._verify = False
+    searcher._fingerprint_index = None
+    searcher._output_formats = ['csv']
+    searcher._progress_interval = 10
+    searcher._progress_file = None
+    hash_files = [write_hash_file(tmp_path / 'p1', [['lib/a-1.0.jar', SHA1], ['lib/a-copy-1.0.jar', SHA1]]),
+                  write_hash_file(tmp_path / 'p2', [['lib/b.jar', OTHER_SHA1], ['lib/a.jar', SHA1]])]
+    searcher.search_projects(hash_files)
+    # each hash value is searched once for all projects
+    assert sorted(searcher._online_client.searches) == [SHA1, OTHER_SHA1]
+    assert read_report(tmp_path / 'p1') == [['lib/a-1.0.jar', SHA1, 'Y'], ['lib/a-copy-1.0.jar', SHA1, 'Y']]
+    assert read_report(tmp_path / 'p2') == [['lib/b.jar', OTHER_SHA1, 'N'], ['lib/a.jar', SHA1, 'Y']]
+    assert (tmp_path / 'p1' / 'pom.xml').read_text(encoding='utf-8').count('<artifactId>a</artifactId>') == 1
+    assert '<artifactId>a</artifactId>' in (tmp_path / 'p2' / 'pom.xml').read_text(encoding='utf-8')
+
+
+class OfflineSearchClient(object):
+    def __getattr__(self, name):
+        raise AssertionError('plans must not use the search client, {0} was called'.format(name))
+
+
+def test_plan_without_network_requests(searcher, tmp_path):
+    cached_sha1, internal_sha1, remote_sha1, other_remote_sha1 = '1' * 40, '2' * 40, '3' * 40, '4' * 40
+    searcher._cache.put(cached_sha1, group_id='g', artifact_id='cached', version='1.0')
+    searcher._online_client = OfflineSearchClient()
+    searcher._verify = True
+    searcher._fingerprint_index = None
+    searcher._internal_prefixes = ('acme-',)
+    searcher._skip_internal = True
+    searcher._rate_limit = 2
+    header = ('File Name', 'sha1', 'Found', 'Group Id', 'Artifact Id', 'Version')
+    hash_files = [
+        write_hash_file(tmp_path / 'p1', [['lib/cached-1.0.jar', cached_sha1, '', '', '', ''],
+                                          ['lib/acme-core-1.0.jar', internal_sha1, '', '', '', ''],
+                                          ['lib/x-1.0.jar', remote_sha1, '', '', '', ''],
+                                          ['lib/x-copy.jar', remote_sha1, '', '', '', ''],
+                                          ['lib/a-1.0.jar', SHA1, 'Y', 'g', 'a', '1.0']], header),
+        write_hash_file(tmp_path / 'p2', [['lib/a.jar', SHA1, 'Y', 'g', 'a', '1.0'],
+                                          ['lib/y.jar', other_remote_sha1, '', '', '', '']], header),
+    ]
+    assert searcher.plan_projects(hash_files) == {
+        'projects': 2,
+        'dependencies': 7,
+        'prefilled': 2,
+        'duplicates': 1,
+        'hash_values': 4,
+        'cache_hits': 1,
+        'skipped_internal': 1,
+        'fingerprint_matches': 0,
+        'remote_lookups': 2,
+        # the pre-filled artifact shared by both projects is verified once
+        'verifications': 1,
+        'remote_requests': 3,
+        'wall_time': 1.5,
+    }
+    assert not (tmp_path / 'p1' / 'report.csv').exists()
@@ -0,0 +1,89 @@
+#  The MIT License (MIT)
+#
+#  Copyright (c) 2021. Scott Lau
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#  SOFTWARE.
+
+import types
+
+import pytest
+
+from sc_gav.cassette import Cassette
+from sc_gav.gav_searcher import GavSearcher
+from sc_gav.http_cache import HttpCache
+from sc_gav.request_api import RequestClient
+
+
+def test_fresh_responses_are_served_from_the_cache(backend, tmp_path):
+    client = RequestClient(url=backend.url, http_cache=HttpCache(path=str(tmp_path / 'http-cache.db')))
+    for _ in range(3):
+        response = client.http_request('get', 'fresh', params={'max_age': '60', 'b': '1'})
+        assert response.status_code == 200
+        assert response.json()['items'] == [1, 2, 3]
+    # the query parameters are normalized
+    client.http_request('get', 'fresh', params={'b': '1', 'max_age': '60'})
+    assert len(backend.requests) == 1
+    statistics = client.http_cache.statistics()
+    assert statistics['hits'] == 3
+    assert statistics['misses'] == 1
+    assert statistics['hit_ratio'] == 0.75
+
+
+def test_stale_responses_are_revalidated(backend, tmp_path):
+    client = RequestClient(url=backend.url, http_cache=HttpCache(path=str(tmp_path / 'http-cache.db')))
+    bodies = [b''.join(client.http_get('stale').iter_content(1024)) for _ in range(3)]
+    assert bodies[0] == bodies[1] == bodies[2]
+    assert [if_none_match for _, if_none_match in backend.requests] == [None, '"v1"', '"v1"']
+    statistics = client.http_cache.statistics()
+    assert statistics['revalidations'] == 2
+    assert statistics['bytes_saved'] == 2 * len(bodies[0])
+
+
+def test_freshness_lifetime():
+    assert HttpCache.freshness_lifetime({'Cache-Control': 'max-age=60'}) == 60
+    assert HttpCache.freshness_lifetime({'Cache-Control': 'max-age=60', 'Age': '50'}) == 10
+    assert HttpCache.freshness_lifetime({'Cache-Control': 'no-cache, max-age=60'}) == 0
+    assert HttpCache.freshness_lifetime({'Cache-Control': 'no-store'}) is None
+    assert HttpCache.freshness_lifetime({'Date': 'Thu, 01 Jan 2026 00:00:00 GMT',
+                                         'Expires': 'Thu, 01 Jan 2026 00:01:00 GMT'}) == 60
+    assert HttpCache.freshness_lifetime({'Expires': '0'}) == 0
+
+
+def test_cassette_cannot_be_combined_with_an_http_cache(tmp_path):
+    cassette = Cassette(path=str(tmp_path / 'cassette.db'), mode=Cassette.RECORD)
+    with pytest.raises(ValueError):
+        RequestClient(url='http://127.0.0.1/', cassette=cassette,
+                      http_cache=HttpCache(path=str(tmp_path / 'http-cache.db')))
+
+
+def test_record_and_replay_with_the_http_cache_enabled(backend, tmp_path):
+    cassette_path = str(tmp_path / 'cassette.db')
+    responses = {}
+    for mode in (Cassette.RECORD, Cassette.REPLAY):
+        settings = types.SimpleNamespace(http_cache_enabled=True, http_cache_path=str(tmp_path / 'http-cache.db'),
+                                         cassette_mode=mode)
+        http_cache = GavSearcher.create_http_cache(settings)
+        assert http_cache is None
+        client = RequestClient(url=backend.url, cassette=Cassette(path=cassette_path, mode=mode),
+                               http_cache=http_cache)
+        responses[mode] = [client.http_get('stale') for _ in range(2)]
+    assert len(backend.requests) == 2
+    for response in responses[Cassette.REPLAY]:
+        assert response.status_code == 200
+        assert response.json() == responses[Cassette.RECORD][0].json()
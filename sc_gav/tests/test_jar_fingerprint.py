@@ -0,0 +1,65 @@
+#  The MIT License (MIT)
+#
+#  Copyright (c) 2021. Scott Lau
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#  SOFTWARE.
+
+import io
+
+from sc_gav.jar_fingerprint import FingerprintIndex, JarFingerprint
+from sc_gav.tests.archives import make_jar
+
+CLASSES = {'org/example/Class{0}.class'.format(number): 'class {0}'.format(number) for number in range(100)}
+
+
+def test_signature_of_a_jar_without_classes():
+    assert JarFingerprint.calculate_signature(io.BytesIO(make_jar({}))) is None
+
+
+def test_similar_jars_have_similar_signatures():
+    signature = JarFingerprint.calculate_signature(io.BytesIO(make_jar(CLASSES)))
+    rebuilt = dict(CLASSES, **{'org/example/Class0.class': 'changed'})
+    rebuilt_signature = JarFingerprint.calculate_signature(io.BytesIO(make_jar(rebuilt)))
+    other = {'com/other/Other{0}.class'.format(number): 'other {0}'.format(number) for number in range(100)}
+    other_signature = JarFingerprint.calculate_signature(io.BytesIO(make_jar(other)))
+    assert JarFingerprint.similarity(signature, signature) == 1.0
+    assert JarFingerprint.similarity(signature, rebuilt_signature) > 0.8
+    assert JarFingerprint.similarity(signature, other_signature) < 0.2
+    assert JarFingerprint.unpack(JarFingerprint.pack(signature)) == signature
+
+
+def test_index_of_a_maven_repository(tmp_path):
+    directory = tmp_path / 'repository' / 'org' / 'example' / 'lib' / '1.0'
+    directory.mkdir(parents=True)
+    (directory / 'lib-1.0.jar').write_bytes(make_jar(CLASSES))
+    (directory / 'lib-1.0-sources.jar').write_bytes(make_jar({}))
+    index = FingerprintIndex(path=str(tmp_path / 'fingerprints.db'))
+    try:
+        assert index.index_maven_repository(str(tmp_path / 'repository')) == 1
+        # indexing again replaces the fingerprint
+        assert index.index_maven_repository(str(tmp_path / 'repository')) == 1
+        rebuilt = dict(CLASSES, **{'org/example/Class0.class': 'changed'})
+        artifact, confidence = index.find_best_match(
+            JarFingerprint.calculate_signature(io.BytesIO(make_jar(rebuilt))), 0.8)
+        assert artifact == {'groupId': 'org.example', 'artifactId': 'lib', 'version': '1.0'}
+        assert confidence > 0.8
+        other = {'com/other/Other.class': 'other'}
+        assert index.find_best_match(JarFingerprint.calculate_signature(io.BytesIO(make_jar(other))), 0.8) is None
+    finally:
+        index.close()
@@ -0,0 +1,72 @@
+#  The MIT License (MIT)
+#
+#  Copyright (c) 2021. Scott Lau
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#  SOFTWARE.
+
+import pytest
+
+from sc_gav.main import Runner, parse_args
+
+
+def test_search_options():
+    args = parse_args(['--plan', '--profile', 'cpu', '--profile-dir', 'profiles', 'batch', 'project'])
+    assert args.command == 'batch'
+    assert args.plan
+    assert args.profile == 'cpu'
+    assert args.profile_dir == 'profiles'
+    assert parse_args(['--plan']).command is None
+
+
+@pytest.mark.parametrize('options', [['--plan'], ['--profile', 'memory'], ['--profile-dir', 'profiles']])
+@pytest.mark.parametrize('command', ['import', 'prefetch', 'index'])
+def test_search_options_are_rejected_by_other_commands(options, command, capsys):
+    with pytest.raises(SystemExit):
+        parse_args(options + [command, 'path'])
+    assert 'is not supported by the {0} command'.format(command) in capsys.readouterr().err
+
+
+class RecordingSearcher(object):
+    def __init__(self):
+        self.searches = []
+
+    def search_projects(self, hash_files, profiler=None):
+        self.searches.append(hash_files)
+
+
+def batch_runner():
+    # bypass the singleton and the configuration
+    runner = object.__new__(Runner)
+    runner._gav_searcher = RecordingSearcher()
+    return runner
+
+
+def test_batch_of_project_directories(tmp_path):
+    (tmp_path / 'p1').mkdir()
+    runner = batch_runner()
+    assert runner.run_batch([str(tmp_path / 'p1'), str(tmp_path / 'p2' / 'lib-hash.csv')]) == 0
+    assert runner._gav_searcher.searches == [[str(tmp_path / 'p1' / 'lib-hash.csv'),
+                                              str(tmp_path / 'p2' / 'lib-hash.csv')]]
+
+
+def test_batch_rejects_hash_files_of_the_same_directory(tmp_path):
+    runner = batch_runner()
+    assert runner.run_batch([str(tmp_path / 'lib-hash.csv'), str(tmp_path / 'other-hash.csv')]) == 1
+    assert runner.run_batch([str(tmp_path), str(tmp_path / '.' / 'lib-hash.csv')]) == 1
+    assert runner._gav_searcher.searches == []
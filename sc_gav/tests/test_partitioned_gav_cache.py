@@ -0,0 +1,99 @@
+#  The MIT License (MIT)
+#
+#  Copyright (c) 2021. Scott Lau
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#  SOFTWARE.
+
+import multiprocessing
+import os
+import threading
+
+from sc_gav.partitioned_gav_cache import PartitionedGavCache
+
+
+def sha1_of(number):
+    return '{0:040x}'.format(number * 7919)
+
+
+def write_artifacts(path, start, count):
+    cache = PartitionedGavCache(path=path, compact_size=4096)
+    cache.put_many((sha1_of(number), 'g', 'a{0}'.format(number), '1.0') for number in range(start, start + count))
+
+
+def test_put_and_get(tmp_path):
+    cache = PartitionedGavCache(path=str(tmp_path))
+    cache.put('ABCDEF' + '0' * 34, group_id='g', artifact_id='a', version='1.0')
+    cache.put('abcdef' + '0' * 34, group_id='g', artifact_id='a', version='2.0')
+    assert cache.get('abcdef' + '0' * 34) == {'groupId': 'g', 'artifactId': 'a', 'version': '2.0'}
+    assert cache.get('1' * 40) is None
+    assert os.path.isfile(os.path.join(str(tmp_path), 'ab.seg'))
+
+
+def test_invalid_artifacts_are_ignored(tmp_path):
+    cache = PartitionedGavCache(path=str(tmp_path))
+    assert cache.put_many([('1' * 40, 'g\t', 'a', '1.0'), ('2' * 40, 'g', 'a', '1.0')]) == 1
+
+
+def test_expired_artifacts(tmp_path):
+    cache = PartitionedGavCache(path=str(tmp_path), ttl=60)
+    cache.put('1' * 40, group_id='g', artifact_id='a', version='1.0')
+    assert cache.get('1' * 40) is not None
+    expired = PartitionedGavCache(path=str(tmp_path), ttl=1e-9)
+    assert expired.get('1' * 40) is None
+
+
+def test_compaction_keeps_the_last_record(tmp_path):
+    cache = PartitionedGavCache(path=str(tmp_path), compact_size=1024 * 1024)
+    for version in range(50):
+        cache.put('1' * 40, group_id='g', artifact_id='a', version=str(version))
+    segment_path = os.path.join(str(tmp_path), '11.seg')
+    size = os.path.getsize(segment_path)
+    cache.compact()
+    assert os.path.getsize(segment_path) < size
+    assert cache.get('1' * 40)['version'] == '49'
+
+
+def test_lookups_while_other_processes_append_and_compact(tmp_path):
+    path = str(tmp_path)
+    writers = [multiprocessing.Process(target=write_artifacts, args=(path, start, 2000))
+               for start in (0, 2000)]
+    for writer in writers:
+        writer.start()
+    cache = PartitionedGavCache(path=path)
+    errors = []
+
+    def read():
+        try:
+            while any(writer.is_alive() for writer in writers):
+                for number in range(0, 4000, 97):
+                    result = cache.get(sha1_of(number))
+                    assert result is None or result['artifactId'] == 'a{0}'.format(number)
+        except Exception as e:
+            errors.append(e)
+
+    readers = [threading.Thread(target=read) for _ in range(4)]
+    for reader in readers:
+        reader.start()
+    for writer in writers:
+        writer.join()
+    for reader in readers:
+        reader.join()
+    assert errors == []
+    assert all(writer.exitcode == 0 for writer in writers)
+    assert all(cache.get(sha1_of(number))['artifactId'] == 'a{0}'.format(number) for number in range(4000))
@@ -0,0 +1,77 @@
+#  The MIT License (MIT)
+#
+#  Copyright (c) 2021. Scott Lau
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#  SOFTWARE.
+
+import cProfile
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from sc_gav.profiler import StageProfiler
+
+
+def fibonacci(number):
+    return number if number < 2 else fibonacci(number - 1) + fibonacci(number - 2)
+
+
+def test_cpu_profile_of_wrapped_functions_run_by_a_thread_pool(tmp_path):
+    profiler = StageProfiler(mode=StageProfiler.CPU, output_directory=str(tmp_path))
+    with profiler.stage('lookup'):
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(profiler.wrap(fibonacci), range(15)))
+    assert results == [fibonacci(number) for number in range(15)]
+    assert os.path.isfile(os.path.join(str(tmp_path), 'lookup.pstats'))
+    with open(os.path.join(str(tmp_path), 'lookup-cpu.txt'), encoding='utf-8') as summary_file:
+        assert 'fibonacci' in summary_file.read()
+
+
+def test_cpu_profile_is_skipped_when_another_profiler_is_active(tmp_path):
+    profiler = StageProfiler(mode=StageProfiler.CPU, output_directory=str(tmp_path))
+    outer_profile = cProfile.Profile()
+    outer_profile.enable()
+    try:
+        with profiler.stage('lookup'):
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                results = list(executor.map(profiler.wrap(fibonacci), range(5)))
+    finally:
+        outer_profile.disable()
+    assert results == [0, 1, 1, 2, 3]
+
+
+def test_memory_profile(tmp_path):
+    profiler = StageProfiler(mode=StageProfiler.MEMORY, output_directory=str(tmp_path))
+    with profiler.stage('parsing'):
+        data = [str(number) for number in range(1000)]
+    assert len(data) == 1000
+    assert os.path.isfile(os.path.join(str(tmp_path), 'parsing-memory.txt'))
+
+
+def test_disabled_profiler_writes_nothing(tmp_path):
+    profiler = StageProfiler(output_directory=str(tmp_path / 'profiles'))
+    with profiler.stage('output'):
+        pass
+    assert profiler.wrap(fibonacci) is fibonacci
+    assert not os.path.exists(str(tmp_path / 'profiles'))
+
+
+def test_format_size():
+    assert StageProfiler.format_size(None) == '-'
+    assert StageProfiler.format_size(512) == '512.0 B'
+    assert StageProfiler.format_size(3 * 1024 * 1024) == '3.0 MiB'
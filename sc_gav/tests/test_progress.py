@@ -0,0 +1,46 @@
+#  The MIT License (MIT)
+#
+#  Copyright (c) 2021. Scott Lau
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#  SOFTWARE.
+
+import json
+
+from sc_gav.progress import ProgressReporter
+
+
+def test_progress_file(tmp_path):
+    progress_file = str(tmp_path / 'progress.json')
+    progress = ProgressReporter(total=3, interval=0, progress_file=progress_file)
+    progress.update(ProgressReporter.HIT)
+    progress.update(ProgressReporter.MISS)
+    progress.finish()
+    with open(progress_file, encoding='utf-8') as input_file:
+        summary = json.load(input_file)
+    assert progress.done == 2
+    assert summary['done'] == 2
+    assert summary['total'] == 3
+    assert summary['hit'] == 1
+    assert summary['miss'] == 1
+    assert summary['finished'] is True
+
+
+def test_format_duration():
+    assert ProgressReporter.format_duration(None) == '-'
+    assert ProgressReporter.format_duration(3725.5) == '1:02:05'
@@ -0,0 +1,97 @@
+#  The MIT License (MIT)
+#
+#  Copyright (c) 2021. Scott Lau
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#  SOFTWARE.
+
+import csv
+import json
+import os
+
+import pytest
+
+from sc_gav import report_writers
+from sc_gav.report_writers import CsvReportWriter, CycloneDxReportWriter, JsonLinesReportWriter, ReportWriter
+
+FOUND = {'filename': 'lib/a-1.0.jar', 'sha1': '1' * 40, 'groupId': 'g', 'artifactId': 'a', 'version': '1.0',
+         'found_with': 'online'}
+NOT_FOUND = {'filename': 'lib/b.jar', 'sha1': '2' * 40, 'groupId': '', 'artifactId': '', 'version': ''}
+
+
+def write_report(writer_class, path):
+    writer = writer_class(path=path)
+    writer.open()
+    assert os.path.isfile(path + '.part')
+    writer.write(FOUND, ReportWriter.FOUND)
+    writer.write(NOT_FOUND, ReportWriter.NOT_FOUND)
+    writer.close()
+    assert not os.path.exists(path + '.part')
+
+
+def test_csv_report(tmp_path):
+    path = str(tmp_path / 'report.csv')
+    write_report(CsvReportWriter, path)
+    with open(path, newline='', encoding='utf-8') as report_file:
+        rows = list(csv.reader(report_file))
+    assert rows[1][:7] == ['lib/a-1.0.jar', '1' * 40, 'Y', 'online', 'g', 'a', '1.0']
+    assert rows[2][:4] == ['lib/b.jar', '2' * 40, 'N', '']
+
+
+def test_jsonl_report(tmp_path):
+    path = str(tmp_path / 'report.jsonl')
+    write_report(JsonLinesReportWriter, path)
+    with open(path, encoding='utf-8') as report_file:
+        rows = [json.loads(line) for line in report_file]
+    assert [row['found'] for row in rows] == ['Y', 'N']
+    assert rows[1]['groupId'] is None
+
+
+def test_cyclonedx_report(tmp_path):
+    path = str(tmp_path / 'bom.json')
+    write_report(CycloneDxReportWriter, path)
+    with open(path, encoding='utf-8') as report_file:
+        bom = json.load(report_file)
+    assert bom['bomFormat'] == 'CycloneDX'
+    assert [component['name'] for component in bom['components']] == ['a', 'b.jar']
+    assert bom['components'][0]['purl'] == 'pkg:maven/g/a@1.0'
+
+
+def test_report_writer_is_abstract(tmp_path):
+    with pytest.raises(TypeError):
+        ReportWriter(path=str(tmp_path / 'report.txt'))
+
+
+class FailingReportWriter(ReportWriter):
+    DEFAULT_FILENAME = 'failing.txt'
+
+    def _write_header(self):
+        raise OSError('disk full')
+
+    def _write_row(self, dependency, found):
+        pass
+
+
+def test_reports_are_discarded_when_a_writer_fails_to_open(searcher, tmp_path, monkeypatch):
+    monkeypatch.setitem(report_writers.REPORT_WRITERS, 'failing', FailingReportWriter)
+    monkeypatch.setattr('sc_gav.gav_searcher.REPORT_WRITERS', report_writers.REPORT_WRITERS)
+    searcher._output_formats = ['csv', 'jsonl', 'failing']
+    with pytest.raises(OSError):
+        searcher._open_report_writers(str(tmp_path))
+    assert os.listdir(str(tmp_path)) == ['cache']
+    assert searcher._report_writers == []
@@ -0,0 +1,93 @@
+#  The MIT License (MIT)
+#
+#  Copyright (c) 2021. Scott Lau
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#  SOFTWARE.
+
+import pytest
+
+from sc_gav.exception import InvalidConfigurationException
+from sc_gav.settings import Settings
+
+
+class DottedConfig(object):
+    def __init__(self, values):
+        self._values = values
+
+    def get(self, key):
+        return self._values.get(key)
+
+
+def load_settings(monkeypatch, values):
+    monkeypatch.setattr('sc_gav.settings.config', DottedConfig(values))
+    # bypass the singleton
+    settings = object.__new__(Settings)
+    settings.__init__()
+    return settings
+
+
+def test_defaults(monkeypatch):
+    settings = load_settings(monkeypatch, {})
+    assert settings.search_url == 'https://search.maven.org'
+    assert settings.workers == 4
+    assert settings.pool_size == 8
+    assert settings.cache_layout == 'sqlite'
+    assert settings.http_cache_enabled is False
+    assert settings.verify_enabled is False
+    assert settings.fingerprint_threshold == 0.8
+    assert settings.progress_interval == 10
+    assert settings.progress_file is None
+    assert settings.tracing_file is None
+    assert settings.output_formats == ['csv']
+
+
+def test_values_set_by_environment_variables(monkeypatch):
+    settings = load_settings(monkeypatch, {'performance.workers': '16', 'cache.enabled': 'false'})
+    assert settings.workers == 16
+    assert settings.pool_size == 16
+    assert settings.cache_enabled is False
+
+
+def test_false_and_zero_values_are_kept(monkeypatch):
+    settings = load_settings(monkeypatch, {'verify.enabled': 'false', 'scan_nested_archives': 'false',
+                                           'fingerprint.threshold': 0, 'progress.interval': '0'})
+    assert settings.verify_enabled is False
+    assert settings.scan_nested_archives is False
+    assert settings.fingerprint_threshold == 0
+    assert settings.progress_interval == 0
+
+
+@pytest.mark.parametrize('key, value', [
+    ('performance.workers', 0),
+    ('performance.workers', 1.5),
+    ('performance.read_timeout', 'slow'),
+    ('cache.layout', 'memory'),
+    ('cassette.mode', 'rewind'),
+    ('search.internal_prefixes', 'acme-'),
+    ('search.url', ''),
+    ('verify.enabled', 'yes'),
+    ('fingerprint.threshold', 1.5),
+    ('progress.interval', 'often'),
+    ('tracing.file', 1),
+    ('output.formats', ['csv', 'xml']),
+    ('output.formats', []),
+])
+def test_invalid_values(monkeypatch, key, value):
+    with pytest.raises(InvalidConfigurationException):
+        load_settings(monkeypatch, {key: value})
@@ -0,0 +1,42 @@
+#  The MIT License (MIT)
+#
+#  Copyright (c) 2021. Scott Lau
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#  SOFTWARE.
+
+import json
+
+from sc_gav.request_api import RequestClient
+from sc_gav.tracing import JsonFileTracer
+
+
+def test_spans_of_requests_are_exported(backend, tmp_path):
+    trace_file = str(tmp_path / 'trace.jsonl')
+    tracer = JsonFileTracer(path=trace_file)
+    client = RequestClient(url=backend.url, tracer=tracer)
+    client.http_request('get', 'search', attempt=2)
+    tracer.close()
+    with open(trace_file, encoding='utf-8') as input_file:
+        spans = [json.loads(line) for line in input_file]
+    assert len(spans) == 1
+    assert spans[0]['name'] == 'HTTP GET'
+    assert spans[0]['status'] == 'OK'
+    assert spans[0]['attributes']['http.status_code'] == 200
+    assert spans[0]['attributes']['http.resend_count'] == 1
+    assert spans[0]['attributes']['http.response_content_length'] > 0
@@ -0,0 +1,210 @@
+#  The MIT License (MIT)
+#
+#  Copyright (c) 2021. Scott Lau
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#  SOFTWARE.
+
+import json
+import socket
+import threading
+import time
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+# span of the request currently sent by this thread, read by the traced connections
+_context = threading.local()
+
+
+def _elapsed_ms(start_time):
+    return (time.perf_counter() - start_time) * 1000
+
+
+class RequestSpan(object):
+    """
+    A span around one backend request.
+
+    Only the subset of the OpenTelemetry ``Span`` interface used by
+    :py:class:`sc_gav.request_api.RequestClient` is implemented, so an
+    OpenTelemetry tracer can be used in place of :py:class:`RequestTracer`.
+
+    Args:
+        tracer (RequestTracer): the tracer exporting this span.
+        name (str): name of the span.
+        attributes (dict): initial attributes.
+    """
+
+    def __init__(self, tracer, name, attributes=None):
+        self._tracer = tracer
+        self._name = name
+        self._attributes = dict(attributes or {})
+        self._exception = None
+        self._start_timestamp = time.time()
+        self._start_time = time.perf_counter()
+        self._duration_ms = None
+
+    def set_attribute(self, key, value):
+        self._attributes[key] = value
+
+    def record_exception(self, exception):
+        self._exception = exception
+
+    def end(self):
+        self._duration_ms = _elapsed_ms(self._start_time)
+        self._tracer.export(self)
+
+    def to_dict(self):
+        span = {
+            'name': self._name,
+            'start_time': self._start_timestamp,
+            'duration_ms': self._duration_ms,
+            'status': 'OK' if self._exception is None else 'ERROR',
+            'attributes': self._attributes,
+        }
+        if self._exception is not None:
+            span['exception'] = '{0}: {1}'.format(type(self._exception).__name__, self._exception)
+        return span
+
+
+class RequestTracer(object):
+    """
+    Creates the spans of backend requests, subclasses export the ended spans.
+    """
+
+    def start_span(self, name, attributes=None):
+        return RequestSpan(self, name, attributes)
+
+    def export(self, span):
+        pass
+
+    def close(self):
+        pass
+
+
+class JsonFileTracer(RequestTracer):
+    """
+    Appends every ended span to a local file as one json object per line.
+
+    Args:
+        path (str): path of the trace file.
+    """
+
+    def __init__(self, *, path):
+        self._path = path
+        self._lock = threading.Lock()
+        self._file = open(path, 'a', encoding='utf-8')
+
+    def export(self, span):
+        line = json.dumps(span.to_dict(), default=str)
+        with self._lock:
+            self._file.write(line)
+            self._file.write('\n')
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+class _TracedConnectionMixin(object):
+    """
+    Records the DNS, TCP connect and TLS handshake times of new connections
+    into the span of the current request.
+    """
+
+    def _new_conn(self):
+        span = getattr(_context, 'span', None)
+        if span is None:
+            return super(_TracedConnectionMixin, self)._new_conn()
+        host = self._dns_host
+        start_time = time.perf_counter()
+        try:
+            address = socket.getaddrinfo(host, self.port, 0, socket.SOCK_STREAM)[0][4][0]
+        except (socket.gaierror, IndexError):
+            # let urllib3 resolve the host again and report the error
+            return super(_TracedConnectionMixin, self)._new_conn()
+        dns_ms = _elapsed_ms(start_time)
+        start_time = time.perf_counter()
+        # connect to the resolved address, TLS still uses the host name
+        self._dns_host = address
+        try:
+            sock = super(_TracedConnectionMixin, self)._new_conn()
+        finally:
+            self._dns_host = host
+        connect_ms = _elapsed_ms(start_time)
+        span.set_attribute('http.dns_ms', dns_ms)
+        span.set_attribute('http.connect_ms', connect_ms)
+        _context.socket_ms = dns_ms + connect_ms
+        return sock
+
+    def connect(self):
+        span = getattr(_context, 'span', None)
+        _context.socket_ms = 0
+        start_time = time.perf_counter()
+        super(_TracedConnectionMixin, self).connect()
+        if span is not None and isinstance(self, HTTPSConnection):
+            span.set_attribute('http.tls_ms', max(_elapsed_ms(start_time) - _context.socket_ms, 0))
+
+
+class TracedHTTPConnection(_TracedConnectionMixin, HTTPConnection):
+    pass
+
+
+class TracedHTTPSConnection(_TracedConnectionMixin, HTTPSConnection):
+    pass
+
+
+class TracedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TracedHTTPConnection
+
+
+class TracedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TracedHTTPSConnection
+
+
+class TracingHTTPAdapter(HTTPAdapter):
+    """
+    A transport adapter whose new connections report their setup times to the
+    span of the current request.
+    """
+
+    def init_poolmanager(self, *args, **kwargs):
+        super(TracingHTTPAdapter, self).init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': TracedHTTPConnectionPool,
+            'https': TracedHTTPSConnectionPool,
+        }
+
+
+class TracingContext(object):
+    """
+    Makes a span the current span of this thread while a request is sent.
+    """
+
+    def __init__(self, span):
+        self._span = span
+
+    def __enter__(self):
+        _context.span = self._span
+        return self._span
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        _context.span = None
+        return False